@@ -1,5 +1,6 @@
 # standard libary imports
 import os
+import struct
 import time
 from typing import (
     Union,
@@ -11,6 +12,7 @@ import logging
 import pandas as pd
 import dask.dataframe as dd
 import numpy as np
+import polars as pl
 import pyarrow as pa
 import pyarrow.parquet as pq
 from alive_progress import alive_bar
@@ -19,6 +21,17 @@ from ..helpers import (
     flatten_dict,
     count_final_values_in_dict,
 )
+from ..helpers.sheet_readers import (
+    benchmark_sheet_reader_backends,
+    sheet_reader_backend_preference,
+)
+from ..helpers.xlsb_writer import (
+    XLSB_DATE_STYLE,
+    biff12_record,
+    biff12_row,
+    biff12_worksheet,
+    write_xlsb,
+)
 from .utils import LoadersDictTypeHint
 from .benchmarks import loaders_dict
 
@@ -54,6 +67,47 @@ def generate_data(
     df.to_parquet(parquet_file, index=False)
 
 
+def generate_xlsb_data(
+    num_sheets: int,
+    num_rows: int,
+    columns: list[str],
+    xlsb_file: str,
+) -> None:
+    """
+    Generate random data and write it to a multi-sheet xlsb workbook, with
+    a header row of column names on every sheet, half-hourly timestamps
+    in a date-styled first column and float cells in the others.
+
+    Args:
+        num_sheets (int): The number of sheets to generate.
+        num_rows (int): The number of data rows to generate per sheet.
+        columns (list): A list of column names.
+        xlsb_file (str): The name of the xlsb file to write.
+    """
+    shared_strings: dict[str, int] = {}
+    header_row: bytes = biff12_row(0, columns, shared_strings)
+    # numeric cells as one structured array per row: record type, record length, column, style, value
+    float_cell_dtype: np.dtype = np.dtype([('type', 'u1'), ('length', 'u1'), ('column', '<u4'), ('style', '<u4'), ('value', '<f8')])
+    float_cells: np.ndarray = np.zeros(len(columns), dtype=float_cell_dtype)
+    float_cells['type'] = 0x05
+    float_cells['length'] = 16
+    float_cells['column'] = np.arange(len(columns))
+    # the first column is date-styled, so readers that detect dates return datetimes
+    float_cells['style'][0] = XLSB_DATE_STYLE
+
+    worksheets: dict[str, bytes] = {}
+    for sheet_number in range(1, num_sheets + 1):
+        data: np.ndarray = np.random.rand(num_rows, len(columns))
+        # Excel serials of half-hourly timestamps from 2023-07-01
+        data[:, 0] = 45108.0 + np.arange(num_rows) / 48
+        row_records: list[bytes] = [header_row]
+        for row_index in range(num_rows):
+            float_cells['value'] = data[row_index]
+            row_records.append(biff12_record(0x0000, struct.pack('<I', row_index + 1)) + float_cells.tobytes())
+        worksheets[f'Sheet{sheet_number}'] = biff12_worksheet(row_records, rows_count=num_rows + 1, columns_count=len(columns))
+    write_xlsb(xlsb_file, worksheets, shared_strings)
+
+
 def __time_how_long_to_load_dataframe(
     loader: Union[Callable, Type],
     file_path_to_load: str,
@@ -147,6 +201,40 @@ def benchmark_loaders(
     _print_load_times(sorted_load_times)
 
 
+def benchmark_xlsb_reader_backends(
+    xlsb_file: str = 'larger_file.xlsb',
+    num_sheets: int = 5,
+    num_rows: int = 50_000,
+    columns: list[str] = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j'],
+    repeat_runs: int = 3,
+) -> None:
+    """benchmark the registered xlsb sheet reader backends on a generated multi-sheet workbook, recording the results"""
+    logging.info('Generating mock xlsb workbook...')
+    generate_xlsb_data(
+        num_sheets=num_sheets,
+        num_rows=num_rows,
+        columns=columns,
+        xlsb_file=xlsb_file,
+    )
+
+    logging.info('Benchmarking xlsb reader backends...')
+    # recorded, so the pipelines' default reader backend follows the measurements
+    benchmark_results: pl.DataFrame = benchmark_sheet_reader_backends(
+        excel_file_filepath=xlsb_file,
+        repeat_runs=repeat_runs,
+    )
+    _print_load_times(
+        {
+            f'LOAD_TIME-xlsb-{reader_backend}': runtime_median_seconds
+            for reader_backend, runtime_median_seconds in benchmark_results.select('reader_backend', 'runtime_median_seconds').iter_rows()
+        }
+    )
+    print(f'sheet reader backend preference: {sheet_reader_backend_preference()}')
+
+    logging.info('Deleting mock xlsb workbook...')
+    os.remove(xlsb_file)
+
+
 # %%
 # Main function
 
@@ -0,0 +1,339 @@
+# %%
+# IMPORTS
+# standard
+from pathlib import Path
+from datetime import date
+from typing import (
+    TypedDict,
+    Literal,
+    IO,
+)
+import logging
+# third-party
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from alive_progress import alive_bar
+# local
+from helpers.rich_logger import getRichLogger
+
+# %%
+# LOGGER
+logger: logging.Logger = getRichLogger(
+    logging_level="DEBUG",
+    logger_name=__name__,
+    traceback_show_locals=True,
+    traceback_extra_lines=10,
+    traceback_suppressed_modules=(),
+)
+
+
+# %%
+# CONFIGURATION
+
+REAL_WEM_RULES_CLAUSES_FILEPATH: str = Path(r"template_project/wem_rules_clauses.ndjson").resolve().as_posix()
+
+SYNTHETIC_DATA_DIRECTORY: str = Path(r"template_project/synthetic_data").resolve().as_posix()
+
+# matches the chapter prefix of chapter, section and clause identifiers, e.g. "3A" in "3A.1.2."
+CHAPTER_PREFIX_REGEX: str = r"^[0-9]+[A-Z]?"
+
+SyntheticFileFormat = Literal["ndjson", "parquet"]
+
+
+# %%
+# CLAUSE STATISTICS
+
+class WemRulesClauseStatistics(TypedDict):
+    """
+    Statistics derived from a real WEM Rules clauses file, used to generate
+    schema-identical synthetic clauses.
+
+    Attributes:
+        clause_templates (pl.DataFrame): The real clauses in document
+            order, with the chapter prefix stripped from identifiers so
+            chapters can be renumbered.
+        chapter_starts (np.ndarray): Row index of each chapter's first
+            clause in `clause_templates`.
+        chapter_lengths (np.ndarray): Number of clauses in each chapter.
+        content_length_histograms (dict[int, tuple[np.ndarray, np.ndarray]]):
+            Per level, the histogram bin edges and cumulative bin
+            probabilities of content length in characters.
+        position_gaps (np.ndarray): Observed gaps between consecutive
+            `position_in_document` values.
+        first_position_in_document (int): The position of the first clause.
+        publication_date (date): The publication date of the real file.
+        content_corpus (np.ndarray): ASCII bytes of all real clause
+            content, sliced to generate synthetic content.
+    """
+    clause_templates: pl.DataFrame
+    chapter_starts: np.ndarray
+    chapter_lengths: np.ndarray
+    content_length_histograms: dict[int, tuple[np.ndarray, np.ndarray]]
+    position_gaps: np.ndarray
+    first_position_in_document: int
+    publication_date: date
+    content_corpus: np.ndarray
+
+
+def derive_wem_rules_clause_statistics(
+    real_clauses: pl.DataFrame,
+    content_length_bins: int = 20,
+) -> WemRulesClauseStatistics:
+    """Derive level structure, content-length histograms and position gaps from real WEM Rules clauses."""
+    real_clauses = real_clauses.sort("position_in_document")
+
+    clause_templates: pl.DataFrame = real_clauses.select(
+        pl.col("level"),
+        pl.col("identifier"),
+        (pl.col("identifier").str.contains(CHAPTER_PREFIX_REGEX) & pl.col("level").is_in([1, 2, 3])).alias("has_chapter_prefix"),
+        pl.col("identifier").str.replace(CHAPTER_PREFIX_REGEX, "").alias("identifier_suffix"),
+    )
+
+    chapter_starts: np.ndarray = (
+        clause_templates
+        .with_row_index("row_index")
+        .filter(pl.col("level") == 1)
+        .get_column("row_index")
+        .to_numpy()
+        .astype(np.int64)
+    )
+    if len(chapter_starts) == 0 or chapter_starts[0] != 0:
+        raise ValueError("Real clauses must start with a level 1 (chapter) clause")
+    chapter_lengths: np.ndarray = np.diff(np.append(chapter_starts, len(clause_templates)))
+
+    content_length_histograms: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    level: int
+    for level in real_clauses.get_column("level").unique().sort().to_list():
+        content_lengths: np.ndarray = (
+            real_clauses
+            .filter(pl.col("level") == level)
+            .get_column("content")
+            .str.len_chars()
+            .to_numpy()
+        )
+        bin_counts, bin_edges = np.histogram(content_lengths, bins=content_length_bins)
+        content_length_histograms[level] = (bin_edges, np.cumsum(bin_counts) / bin_counts.sum())
+
+    position_gaps: np.ndarray = (
+        real_clauses
+        .get_column("position_in_document")
+        .diff()
+        .drop_nulls()
+        .to_numpy()
+    )
+
+    content_corpus: np.ndarray = np.frombuffer(
+        " ".join(real_clauses.get_column("content").to_list()).encode("ascii", errors="ignore"),
+        dtype=np.uint8,
+    )
+
+    return {
+        "clause_templates": clause_templates,
+        "chapter_starts": chapter_starts,
+        "chapter_lengths": chapter_lengths,
+        "content_length_histograms": content_length_histograms,
+        "position_gaps": position_gaps,
+        "first_position_in_document": int(real_clauses.get_column("position_in_document")[0]),
+        "publication_date": date.fromisoformat(real_clauses.get_column("wem_rules_publication_iso_date")[0]),
+        "content_corpus": content_corpus,
+    }
+
+
+# %%
+# GENERATORS
+
+def _concatenate_ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Vectorised equivalent of `np.concatenate([np.arange(s, s + n) for s, n in zip(starts, lengths)])`."""
+    range_offsets: np.ndarray = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + (np.arange(lengths.sum()) - range_offsets)
+
+
+def _sample_content_lengths(
+    levels: np.ndarray,
+    content_length_histograms: dict[int, tuple[np.ndarray, np.ndarray]],
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Sample a content length for each clause from the histogram of its level."""
+    content_lengths: np.ndarray = np.ones(len(levels), dtype=np.int64)
+    level: int
+    for level, (bin_edges, cumulative_probabilities) in content_length_histograms.items():
+        level_mask: np.ndarray = levels == level
+        bin_indices: np.ndarray = np.minimum(
+            np.searchsorted(cumulative_probabilities, rng.random(level_mask.sum()), side="right"),
+            len(cumulative_probabilities) - 1,
+        )
+        bin_lower_edges: np.ndarray = bin_edges[bin_indices]
+        bin_widths: np.ndarray = bin_edges[bin_indices + 1] - bin_lower_edges
+        content_lengths[level_mask] = bin_lower_edges + rng.random(level_mask.sum()) * bin_widths
+    return np.maximum(content_lengths, 1)
+
+
+def _sample_content(
+    content_lengths: np.ndarray,
+    content_corpus: np.ndarray,
+    rng: np.random.Generator,
+) -> pa.Array:
+    """Build a string array of random corpus slices by assembling the Arrow buffers directly."""
+    content_lengths = np.minimum(content_lengths, len(content_corpus))
+    slice_starts: np.ndarray = (rng.random(len(content_lengths)) * (len(content_corpus) - content_lengths)).astype(np.int64)
+    content_bytes: np.ndarray = content_corpus[_concatenate_ranges(slice_starts, content_lengths)]
+    offsets: np.ndarray = np.concatenate([[0], np.cumsum(content_lengths)]).astype(np.int64)
+    return pa.LargeStringArray.from_buffers(
+        len(content_lengths),
+        pa.py_buffer(offsets),
+        pa.py_buffer(content_bytes),
+    )
+
+
+def generate_synthetic_wem_rules_clauses_chunk(
+    statistics: WemRulesClauseStatistics,
+    versions_count: int,
+    first_version_index: int,
+    publication_interval_days: int,
+    rng: np.random.Generator,
+) -> pl.DataFrame:
+    """
+    Generate the clauses of `versions_count` consecutive synthetic WEM Rules
+    versions. Each version is a document of chapters resampled with
+    replacement from the real file, renumbered in order, so the level
+    sequence within each chapter is realistic.
+    """
+    chapters_per_version: int = len(statistics["chapter_starts"])
+    chapter_choices: np.ndarray = rng.integers(0, chapters_per_version, size=versions_count * chapters_per_version)
+    chapter_lengths: np.ndarray = statistics["chapter_lengths"][chapter_choices]
+    version_lengths: np.ndarray = chapter_lengths.reshape(versions_count, chapters_per_version).sum(axis=1)
+    rows_count: int = int(version_lengths.sum())
+
+    template_row_indices: np.ndarray = _concatenate_ranges(statistics["chapter_starts"][chapter_choices], chapter_lengths)
+    chapter_numbers: np.ndarray = np.repeat(np.tile(np.arange(1, chapters_per_version + 1), versions_count), chapter_lengths)
+    version_indices: np.ndarray = np.repeat(np.arange(first_version_index, first_version_index + versions_count), version_lengths)
+
+    # positions restart at the first real position for every version
+    position_gaps: np.ndarray = rng.choice(statistics["position_gaps"], size=rows_count)
+    version_first_rows: np.ndarray = np.cumsum(version_lengths) - version_lengths
+    position_gaps[version_first_rows] = 0
+    cumulative_gaps: np.ndarray = np.cumsum(position_gaps)
+    positions_in_document: np.ndarray = (
+        statistics["first_position_in_document"]
+        + cumulative_gaps
+        - np.repeat(cumulative_gaps[version_first_rows], version_lengths)
+    )
+
+    clause_templates: pl.DataFrame = statistics["clause_templates"][template_row_indices]
+    content: pa.Array = _sample_content(
+        content_lengths=_sample_content_lengths(
+            levels=clause_templates.get_column("level").to_numpy(),
+            content_length_histograms=statistics["content_length_histograms"],
+            rng=rng,
+        ),
+        content_corpus=statistics["content_corpus"],
+        rng=rng,
+    )
+
+    return (
+        clause_templates
+        .with_columns(
+            pl.Series("chapter_number", chapter_numbers),
+            pl.Series("version_index", version_indices),
+            pl.Series("position_in_document", positions_in_document, dtype=pl.Int64),
+            pl.Series("content", pl.from_arrow(content), dtype=pl.Utf8),
+        )
+        .select(
+            pl.when(pl.col("has_chapter_prefix"))
+            .then(pl.concat_str(pl.col("chapter_number").cast(pl.Utf8), pl.col("identifier_suffix")))
+            .otherwise(pl.col("identifier"))
+            .alias("identifier"),
+            pl.col("content"),
+            pl.col("position_in_document"),
+            (
+                pl.lit(statistics["publication_date"])
+                + pl.duration(days=pl.col("version_index") * publication_interval_days)
+            ).dt.strftime("%Y-%m-%d").alias("wem_rules_publication_iso_date"),
+            pl.col("level"),
+        )
+    )
+
+
+def generate_synthetic_wem_rules_clauses(
+    output_filepath: str,
+    rows_count: int,
+    file_format: SyntheticFileFormat = "parquet",
+    real_clauses_filepath: str = REAL_WEM_RULES_CLAUSES_FILEPATH,
+    chunk_rows: int = 1_000_000,
+    publication_interval_days: int = 7,
+    seed: int = 0,
+) -> str:
+    """
+    Generate a synthetic WEM Rules clauses file with the same schema as the
+    real NDJSON file, at an arbitrary number of rows.
+
+    Level distributions, within-chapter level sequences, content-length
+    histograms and position gaps are derived from the real file. Each
+    synthetic WEM Rules version is published `publication_interval_days`
+    after the previous one. Rows are generated and written in chunks of
+    roughly `chunk_rows`, so memory use is bounded by the chunk size rather
+    than `rows_count`. Returns the output filepath.
+    """
+    statistics: WemRulesClauseStatistics = derive_wem_rules_clause_statistics(
+        real_clauses=pl.read_ndjson(real_clauses_filepath),
+    )
+    rng: np.random.Generator = np.random.default_rng(seed)
+
+    mean_version_rows: float = float(statistics["chapter_lengths"].mean() * len(statistics["chapter_lengths"]))
+    versions_per_chunk: int = max(int(chunk_rows // mean_version_rows), 1)
+    publication_days_required: int = (int(np.ceil(rows_count / mean_version_rows)) + versions_per_chunk) * publication_interval_days
+    if publication_days_required > (date.max - statistics["publication_date"]).days:
+        raise ValueError(
+            f"{rows_count} rows at {publication_interval_days} day publication intervals exceeds the maximum date, "
+            "reduce `publication_interval_days`"
+        )
+
+    Path(output_filepath).parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Generating {rows_count:,} synthetic WEM Rules clauses to '{output_filepath}'...")
+    rows_written: int = 0
+    versions_written: int = 0
+    parquet_writer: pq.ParquetWriter | None = None
+    ndjson_file: IO[bytes] | None = open(output_filepath, "wb") if file_format == "ndjson" else None
+    try:
+        with alive_bar(rows_count, title="Generating synthetic WEM Rules clauses") as bar:
+            while rows_written < rows_count:
+                chunk: pl.DataFrame = generate_synthetic_wem_rules_clauses_chunk(
+                    statistics=statistics,
+                    versions_count=versions_per_chunk,
+                    first_version_index=versions_written,
+                    publication_interval_days=publication_interval_days,
+                    rng=rng,
+                ).head(rows_count - rows_written)
+                if ndjson_file is not None:
+                    chunk.write_ndjson(ndjson_file)
+                else:
+                    chunk_table: pa.Table = chunk.to_arrow()
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(output_filepath, chunk_table.schema, compression="zstd")
+                    parquet_writer.write_table(chunk_table)
+                rows_written += chunk.height
+                versions_written += versions_per_chunk
+                bar(chunk.height)
+    finally:
+        if ndjson_file is not None:
+            ndjson_file.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+    logger.info(f"Generating {rows_count:,} synthetic WEM Rules clauses to '{output_filepath}'...DONE")
+
+    return output_filepath
+
+
+# %%
+# MAIN PROGRAM
+
+if __name__ == "__main__":
+    rows_count: int
+    for rows_count in (100_000, 1_000_000, 10_000_000):
+        generate_synthetic_wem_rules_clauses(
+            output_filepath=f"{SYNTHETIC_DATA_DIRECTORY}/wem_rules_clauses_{rows_count}.parquet",
+            rows_count=rows_count,
+            file_format="parquet",
+        )
@@ -15,6 +15,7 @@ from .file_utils import (
 from .validate_arguments import validate_arguments
 from .render_plantuml_diagram import render_plantuml_diagram
 from .environment_setup import update_conda_environment_to_production_environment
+from .profiling_utils import PeakRssTracker
 
 __all__: list[str] = [
     "getRichLogger",
@@ -27,5 +28,6 @@ __all__: list[str] = [
     "append_string_to_start_or_end_of_file",
     "add_flags_to_cli_arugments",
     "update_conda_environment_to_production_environment",
+    "PeakRssTracker",
     "_replace_an_item_in_list"
 ]
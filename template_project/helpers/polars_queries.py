@@ -74,3 +74,50 @@ def cast_excel_1900_date_system_datetime(
         column=seconds_since_1970_epoch,
         time_unit='s'
     )
+
+
+def financial_year(
+    datetime_column: pl.Expr | str,
+    first_month: int = 7,
+) -> pl.Expr:
+    """
+    Labels each datetime with its financial year, such as "2023-24" for
+    the year starting July 2023.
+
+    Args:
+        datetime_column (pl.Expr | str): The datetime column name, or a
+        Polars Expr of datetimes.
+        first_month (int): The month each financial year starts in.
+
+    Returns:
+        pl.Expr: The "YYYY-YY" financial year label as a Polars Expr.
+
+    Example:
+        >>> df = pl.DataFrame({
+        ...     "date": [datetime(2023, 6, 30), datetime(2023, 7, 1)],
+        ... })
+        >>> df.select(financial_year("date"))
+        # ["2022-23", "2023-24"]
+
+    Note:
+        Labels sort in chronological order, so year ranges can be
+        filtered with string comparisons.
+    """
+    # if passes as a string, convert to Polars Expr
+    datetime_column_expr: pl.Expr = (
+        pl.col(cast(str, datetime_column))
+        if isinstance(datetime_column, str)
+        else cast(pl.Expr, datetime_column)
+    )
+
+    # the calendar year each financial year starts in
+    start_year: pl.Expr = (
+        datetime_column_expr.dt.year()
+        .sub(datetime_column_expr.dt.month().lt(first_month).cast(pl.Int32))
+    )
+
+    return pl.concat_str(
+        start_year.cast(pl.Utf8),
+        pl.lit("-"),
+        start_year.add(1).mod(100).cast(pl.Utf8).str.zfill(2),
+    )
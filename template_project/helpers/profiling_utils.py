@@ -0,0 +1,57 @@
+# standard library imports
+from types import TracebackType
+import threading
+# third party imports
+import psutil
+
+
+class PeakRssTracker:
+    """
+    Context manager that samples the resident set size (RSS) of the current
+    process in a background thread and records the peak.
+
+    Unlike `tracemalloc`, RSS includes memory allocated outside the Python
+    allocator, such as polars' Rust-side buffers.
+
+    Example:
+        >>> with PeakRssTracker() as tracker:
+        ...     lf.collect()
+        >>> tracker.peak_rss_increase_bytes
+    """
+
+    def __init__(self, sampling_interval_seconds: float = 0.005) -> None:
+        self.sampling_interval_seconds: float = sampling_interval_seconds
+        self.baseline_rss_bytes: int = 0
+        self.peak_rss_bytes: int = 0
+        self._process: psutil.Process = psutil.Process()
+        self._stop_event: threading.Event = threading.Event()
+        self._sampling_thread: threading.Thread | None = None
+
+    @property
+    def peak_rss_increase_bytes(self) -> int:
+        """Peak RSS reached inside the context, relative to RSS on entry."""
+        return max(self.peak_rss_bytes - self.baseline_rss_bytes, 0)
+
+    def _sample_rss(self) -> None:
+        while not self._stop_event.wait(self.sampling_interval_seconds):
+            self.peak_rss_bytes = max(self.peak_rss_bytes, self._process.memory_info().rss)
+
+    def __enter__(self) -> "PeakRssTracker":
+        self.baseline_rss_bytes = self._process.memory_info().rss
+        self.peak_rss_bytes = self.baseline_rss_bytes
+        self._stop_event.clear()
+        self._sampling_thread = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampling_thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._stop_event.set()
+        if self._sampling_thread is not None:
+            self._sampling_thread.join()
+        # final sample catches allocations made after the last interval
+        self.peak_rss_bytes = max(self.peak_rss_bytes, self._process.memory_info().rss)
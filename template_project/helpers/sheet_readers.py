@@ -0,0 +1,250 @@
+# standard library imports
+from datetime import (
+    date,
+    datetime,
+    time as time_of_day,
+    timedelta,
+)
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    TypedDict,
+)
+import importlib.util
+import logging
+import math
+import time
+# third party imports
+import numpy as np
+import polars as pl
+import pyxlsb
+
+
+class SheetReaderBackend(TypedDict):
+    """
+    Reads the sheets of an xlxb workbook. `iter_sheet_rows` yields each
+    row's cell values with numbers and dates as floats and empty cells as
+    None, so every backend produces the same conversions.
+    """
+    module_name: str
+    open_workbook: Callable[[str], Any]
+    sheet_names: Callable[[Any], list[str]]
+    iter_sheet_rows: Callable[[Any, str], Iterator[list[Any]]]
+
+
+EXCEL_1900_DATE_SYSTEM_EPOCH: datetime = datetime(1899, 12, 30)
+SECONDS_IN_DAY: int = 60 * 60 * 24
+
+
+def excel_1900_date_system_serial(value: date | datetime | time_of_day | timedelta) -> float:
+    """
+    The Excel 1900 date system serial (fractional days) of a date, datetime,
+    time of day or duration, the inverse of `cast_excel_1900_date_system_datetime`.
+    """
+    if isinstance(value, timedelta):
+        return value.total_seconds() / SECONDS_IN_DAY
+    if isinstance(value, time_of_day):
+        return (value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1_000_000) / SECONDS_IN_DAY
+    value_datetime: datetime = value if isinstance(value, datetime) else datetime(value.year, value.month, value.day)
+    return (value_datetime - EXCEL_1900_DATE_SYSTEM_EPOCH).total_seconds() / SECONDS_IN_DAY
+
+
+def _normalise_cell_value(value: Any) -> Any:
+    """
+    A cell value as pyxlsb reads it: numbers as floats, date-styled cells
+    as Excel serials and empty cells (blank strings or NaN) as None.
+    Readers that return date-styled cells as datetimes (e.g. calamine)
+    keep only millisecond resolution, so their serials match pyxlsb's
+    exactly only for whole-millisecond times such as interval timestamps.
+    """
+    if value is None or (isinstance(value, str) and value == "") or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, (date, time_of_day, timedelta)):
+        return excel_1900_date_system_serial(value)
+    return value
+
+
+def _pyxlsb_sheet_names(workbook: pyxlsb.Workbook) -> list[str]:
+    return workbook.sheets
+
+
+def _iter_pyxlsb_sheet_rows(workbook: pyxlsb.Workbook, sheet_name: str) -> Iterator[list[Any]]:
+    sheet: pyxlsb.Worksheet
+    with workbook.get_sheet(sheet_name) as sheet:
+        for row in sheet.rows():
+            yield [cell.v for cell in row]
+
+
+def _open_pandas_workbook(excel_file_filepath: str) -> Any:
+    import pandas as pd
+    return pd.ExcelFile(excel_file_filepath, engine="pyxlsb")
+
+
+def _pandas_sheet_names(workbook: Any) -> list[str]:
+    return workbook.sheet_names
+
+
+def _iter_pandas_sheet_rows(workbook: Any, sheet_name: str) -> Iterator[list[Any]]:
+    # pandas reads the whole sheet into a dataframe, converting whole-number floats to ints
+    for row in workbook.parse(sheet_name, header=None).itertuples(index=False, name=None):
+        yield [_normalise_cell_value(value) for value in row]
+
+
+def _open_calamine_workbook(excel_file_filepath: str) -> Any:
+    from python_calamine import CalamineWorkbook
+    return CalamineWorkbook.from_path(excel_file_filepath)
+
+
+def _calamine_sheet_names(workbook: Any) -> list[str]:
+    return workbook.sheet_names
+
+
+def _iter_calamine_sheet_rows(workbook: Any, sheet_name: str) -> Iterator[list[Any]]:
+    for row in workbook.get_sheet_by_name(sheet_name).iter_rows():
+        yield [_normalise_cell_value(value) for value in row]
+
+
+SHEET_READER_BACKENDS: dict[str, SheetReaderBackend] = {
+    "pyxlsb": {
+        "module_name": "pyxlsb",
+        "open_workbook": pyxlsb.open_workbook,
+        "sheet_names": _pyxlsb_sheet_names,
+        "iter_sheet_rows": _iter_pyxlsb_sheet_rows,
+    },
+    "pandas": {
+        "module_name": "pandas",
+        "open_workbook": _open_pandas_workbook,
+        "sheet_names": _pandas_sheet_names,
+        "iter_sheet_rows": _iter_pandas_sheet_rows,
+    },
+    # Rust reader, an optional dependency (python-calamine)
+    "calamine": {
+        "module_name": "python_calamine",
+        "open_workbook": _open_calamine_workbook,
+        "sheet_names": _calamine_sheet_names,
+        "iter_sheet_rows": _iter_calamine_sheet_rows,
+    },
+}
+
+# median read times per backend, appended by `benchmark_sheet_reader_backends`
+SHEET_READER_BENCHMARK_RESULTS_FILEPATH: str = (
+    Path(__file__).resolve().parents[1].joinpath("benchmark_results", "sheet_reader_backends.parquet").as_posix()
+)
+
+
+def installed_sheet_reader_backends() -> list[str]:
+    """Names of the sheet reader backends whose module is installed, in `SHEET_READER_BACKENDS` order."""
+    return [
+        backend_name
+        for backend_name, sheet_reader_backend in SHEET_READER_BACKENDS.items()
+        if importlib.util.find_spec(sheet_reader_backend["module_name"]) is not None
+    ]
+
+
+def read_all_sheet_rows(excel_file_filepath: str, reader_backend: str) -> int:
+    """Read every row of every sheet of a workbook with a sheet reader backend, returning the number of rows read."""
+    sheet_reader_backend: SheetReaderBackend = SHEET_READER_BACKENDS[reader_backend]
+    workbook: Any = sheet_reader_backend["open_workbook"](excel_file_filepath)
+    try:
+        return sum(
+            1
+            for sheet_name in sheet_reader_backend["sheet_names"](workbook)
+            for _ in sheet_reader_backend["iter_sheet_rows"](workbook, sheet_name)
+        )
+    finally:
+        workbook.close()
+
+
+def benchmark_sheet_reader_backends(
+    excel_file_filepath: str,
+    repeat_runs: int = 3,
+    results_filepath: str | None = SHEET_READER_BENCHMARK_RESULTS_FILEPATH,
+) -> pl.DataFrame:
+    """
+    Time reading every sheet of a workbook with each installed sheet reader
+    backend, through its registered `iter_sheet_rows` so the cost of
+    normalising cell values is included. Returns the median of
+    `repeat_runs` runs per backend, fastest first, and appends it to
+    `results_filepath` (skipped if None), from which
+    `sheet_reader_backend_preference` orders the backends.
+    """
+    benchmark_results: list[dict[str, Any]] = []
+    backend_name: str
+    for backend_name in installed_sheet_reader_backends():
+        runtimes_seconds: list[float] = []
+        for _ in range(repeat_runs):
+            start_time: float = time.perf_counter()
+            rows_read: int = read_all_sheet_rows(excel_file_filepath, backend_name)
+            runtimes_seconds.append(time.perf_counter() - start_time)
+        benchmark_results.append(
+            {
+                "reader_backend": backend_name,
+                "rows_read": rows_read,
+                "runtime_median_seconds": float(np.median(runtimes_seconds)),
+                "repeat_runs": repeat_runs,
+                "benchmarked_at": datetime.now(),
+            }
+        )
+    benchmark_results_df: pl.DataFrame = pl.DataFrame(benchmark_results).sort("runtime_median_seconds")
+    if results_filepath is not None:
+        Path(results_filepath).parent.mkdir(parents=True, exist_ok=True)
+        if Path(results_filepath).exists():
+            benchmark_results_df = pl.concat([pl.read_parquet(results_filepath), benchmark_results_df], how="diagonal")
+        benchmark_results_df.write_parquet(results_filepath)
+    return benchmark_results_df.tail(len(benchmark_results))
+
+
+def sheet_reader_backend_preference(
+    results_filepath: str = SHEET_READER_BENCHMARK_RESULTS_FILEPATH,
+) -> tuple[str, ...]:
+    """
+    Sheet reader backends fastest first, by each backend's most recent
+    median read time in `results_filepath`. Backends never benchmarked
+    follow in `SHEET_READER_BACKENDS` order, which is the whole order
+    until `benchmark_sheet_reader_backends` has been run.
+    """
+    benchmarked_backends: list[str] = []
+    if Path(results_filepath).exists():
+        benchmarked_backends = (
+            pl.read_parquet(results_filepath)
+            .filter(pl.col("reader_backend").is_in(list(SHEET_READER_BACKENDS)))
+            .sort("benchmarked_at")
+            .group_by("reader_backend")
+            .agg(pl.col("runtime_median_seconds").last())
+            .sort("runtime_median_seconds", "reader_backend")
+            .get_column("reader_backend")
+            .to_list()
+        )
+    return (
+        *benchmarked_backends,
+        *(backend_name for backend_name in SHEET_READER_BACKENDS if backend_name not in benchmarked_backends),
+    )
+
+
+def select_sheet_reader_backend(
+    reader_backend: str | None = None,
+    results_filepath: str = SHEET_READER_BENCHMARK_RESULTS_FILEPATH,
+) -> str:
+    """
+    The name of `reader_backend`, checking it is installed, or if None of
+    the fastest installed backend in `sheet_reader_backend_preference`.
+    """
+    if reader_backend is not None:
+        if reader_backend not in SHEET_READER_BACKENDS:
+            raise ValueError(f"Unknown sheet reader backend '{reader_backend}', expected one of {list(SHEET_READER_BACKENDS)}")
+        if importlib.util.find_spec(SHEET_READER_BACKENDS[reader_backend]["module_name"]) is None:
+            raise ImportError(f"Sheet reader backend '{reader_backend}' requires {SHEET_READER_BACKENDS[reader_backend]['module_name']}")
+        return reader_backend
+    installed_backends: list[str] = installed_sheet_reader_backends()
+    backend_name: str
+    for backend_name in sheet_reader_backend_preference(results_filepath):
+        if backend_name in installed_backends:
+            logging.debug(f"Selected sheet reader backend '{backend_name}'")
+            return backend_name
+    raise ImportError(f"No sheet reader backend installed, expected one of {list(SHEET_READER_BACKENDS)}")
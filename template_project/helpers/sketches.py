@@ -0,0 +1,132 @@
+# standard library imports
+import math
+# third party imports
+import numpy as np
+import polars as pl
+
+
+class HyperLogLog:
+    """
+    Mergeable HyperLogLog sketch of the number of distinct values, using
+    constant memory of `2 ** precision` one-byte registers.
+
+    Values are hashed with polars' `Series.hash`, so sketches are only
+    mergeable when built with the same polars version and `seed`.
+
+    Example:
+        >>> sketch = HyperLogLog()
+        >>> sketch.update(pl.Series(["1.1.", "1.2.", "1.1."]))
+        >>> round(sketch.estimate())
+        2
+    """
+
+    def __init__(self, precision: int = 14, seed: int = 0) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision: int = precision
+        self.seed: int = seed
+        self.registers: np.ndarray = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values: pl.Series) -> None:
+        """Add the non-null values of a series to the sketch."""
+        hashes: np.ndarray = values.drop_nulls().hash(seed=self.seed).to_numpy().astype(np.uint64)
+        if len(hashes) == 0:
+            return
+        register_indices: np.ndarray = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remaining_bits: np.ndarray = hashes << np.uint64(self.precision)
+        # leading zeros of the remaining bits, from the float exponent of each value
+        _, exponents = np.frexp(remaining_bits.astype(np.float64))
+        leading_zeros: np.ndarray = np.clip(64 - exponents, 0, 64 - self.precision)
+        ranks: np.ndarray = np.where(remaining_bits == 0, 64 - self.precision + 1, leading_zeros + 1).astype(np.uint8)
+        np.maximum.at(self.registers, register_indices, ranks)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch into this one, as if it had seen both sets of values."""
+        if (other.precision, other.seed) != (self.precision, self.seed):
+            raise ValueError("Only sketches with the same precision and seed can be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values, with linear counting for small cardinalities."""
+        registers_count: int = len(self.registers)
+        alpha: float = 0.7213 / (1 + 1.079 / registers_count)
+        raw_estimate: float = alpha * registers_count ** 2 / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        empty_registers_count: int = int(np.count_nonzero(self.registers == 0))
+        if raw_estimate <= 2.5 * registers_count and empty_registers_count > 0:
+            return registers_count * math.log(registers_count / empty_registers_count)
+        return raw_estimate
+
+
+class TDigest:
+    """
+    Mergeable t-digest sketch of a numeric distribution, for approximate
+    quantiles in memory bounded by `compression / 2` centroids.
+
+    Centroids are compressed with the arcsine scale function, so quantiles
+    near 0 and 1 are more accurate than the median.
+
+    Example:
+        >>> sketch = TDigest()
+        >>> sketch.update(np.arange(1_000))
+        >>> sketch.quantile(0.5)
+        499.5
+    """
+
+    def __init__(self, compression: int = 200) -> None:
+        self.compression: int = compression
+        self.means: np.ndarray = np.empty(0, dtype=np.float64)
+        self.weights: np.ndarray = np.empty(0, dtype=np.float64)
+        self.min: float = math.inf
+        self.max: float = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        sort_order: np.ndarray = np.argsort(means, kind="stable")
+        means, weights = means[sort_order], weights[sort_order]
+        cumulative_weights: np.ndarray = np.cumsum(weights)
+        quantile_midpoints: np.ndarray = (cumulative_weights - weights / 2) / cumulative_weights[-1]
+        # centroids falling in the same unit of k-space are merged
+        scale: np.ndarray = self.compression / (2 * math.pi) * np.arcsin(2 * quantile_midpoints - 1)
+        _, centroid_indices = np.unique(np.floor(scale), return_inverse=True)
+        self.weights = np.bincount(centroid_indices, weights=weights)
+        self.means = np.bincount(centroid_indices, weights=means * weights) / self.weights
+
+    def update(self, values: np.ndarray) -> None:
+        """Add values to the sketch, ignoring NaNs."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(
+            means=np.concatenate([self.means, values]),
+            weights=np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other: "TDigest") -> None:
+        """Merge another sketch into this one, as if it had seen both sets of values."""
+        if other.count == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            means=np.concatenate([self.means, other.means]),
+            weights=np.concatenate([self.weights, other.weights]),
+        )
+
+    def quantile(self, quantile: float) -> float | None:
+        """Approximate value at `quantile` (between 0 and 1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        centroid_midpoints: np.ndarray = np.cumsum(self.weights) - self.weights / 2
+        return float(
+            np.interp(
+                quantile * self.count,
+                np.concatenate([[0.0], centroid_midpoints, [self.count]]),
+                np.concatenate([[self.min], self.means, [self.max]]),
+            )
+        )
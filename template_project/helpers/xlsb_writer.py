@@ -0,0 +1,131 @@
+# standard library imports
+from datetime import date
+from typing import (
+    Any,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+import struct
+import zipfile
+# local imports
+from .sheet_readers import excel_1900_date_system_serial
+
+# cell formats written to every workbook's styles part: 0 general, 1 built-in number format 22 (m/d/yyyy h:mm)
+XLSB_GENERAL_STYLE: int = 0
+XLSB_DATE_STYLE: int = 1
+
+
+def biff12_record(record_type: int, data: bytes = b"") -> bytes:
+    """Encode a BIFF12 record, its type and length as variable-length little-endian integers."""
+    record_type_bytes: bytes = record_type.to_bytes(4, "little").rstrip(b"\x00") or b"\x00"
+    length_bytes: bytearray = bytearray()
+    length: int = len(data)
+    while True:
+        length_bytes.append((length & 0x7F) | (0x80 if length > 0x7F else 0))
+        length >>= 7
+        if not length:
+            break
+    return record_type_bytes + bytes(length_bytes) + data
+
+
+def biff12_wide_string(value: str) -> bytes:
+    """Encode a BIFF12 length-prefixed UTF-16 string."""
+    return struct.pack("<I", len(value)) + value.encode("utf-16-le")
+
+
+def biff12_row(row_index: int, row: Sequence[Any], shared_strings: dict[str, int]) -> bytes:
+    """
+    Encode a sheet row's records: strings as references into
+    `shared_strings` (added to it as first seen), dates and datetimes as
+    date-styled Excel serials and numbers as floats. None cells are left
+    empty, so a row of only None cells is a blank row.
+    """
+    records: list[bytes] = [biff12_record(0x0000, struct.pack("<I", row_index))]
+    column_index: int
+    value: Any
+    for column_index, value in enumerate(row):
+        if isinstance(value, str):
+            shared_string_index: int = shared_strings.setdefault(value, len(shared_strings))
+            records.append(biff12_record(0x0007, struct.pack("<III", column_index, XLSB_GENERAL_STYLE, shared_string_index)))
+        elif isinstance(value, date):
+            records.append(biff12_record(0x0005, struct.pack("<IId", column_index, XLSB_DATE_STYLE, excel_1900_date_system_serial(value))))
+        elif value is not None:
+            records.append(biff12_record(0x0005, struct.pack("<IId", column_index, XLSB_GENERAL_STYLE, value)))
+    return b"".join(records)
+
+
+def biff12_worksheet(row_records: Iterable[bytes], rows_count: int, columns_count: int, first_row: int = 0) -> bytes:
+    """
+    Encode a worksheet part from its rows' records, with the dimension
+    record of a `rows_count` x `columns_count` used range starting at row
+    `first_row` (rows above it are blank).
+    """
+    return b"".join(
+        [
+            biff12_record(0x0181),
+            biff12_record(0x0194, struct.pack("<IIII", first_row, first_row + rows_count - 1, 0, columns_count - 1)),
+            biff12_record(0x0191),
+            *row_records,
+            biff12_record(0x0192),
+            biff12_record(0x0182),
+        ]
+    )
+
+
+def write_xlsb(
+    xlsb_file: str,
+    worksheets: Mapping[str, bytes],
+    shared_strings: Iterable[str],
+) -> str:
+    """
+    Write an xlsb workbook of `{sheet_name: worksheet part}` (see
+    `biff12_worksheet`), with its shared strings, styles and relationships.
+    Only the records the xlsb readers need are written, as no library
+    writes xlsb. Returns the workbook filepath.
+    """
+    shared_strings = list(shared_strings)
+    workbook_records: list[bytes] = [biff12_record(0x0183), biff12_record(0x018F)]
+    relationships: list[str] = []
+    with zipfile.ZipFile(xlsb_file, "w", zipfile.ZIP_DEFLATED) as xlsb_zip:
+        sheet_number: int
+        sheet_name: str
+        worksheet: bytes
+        for sheet_number, (sheet_name, worksheet) in enumerate(worksheets.items(), start=1):
+            workbook_records.append(
+                biff12_record(0x019C, struct.pack("<II", 0, sheet_number) + biff12_wide_string(f"rId{sheet_number}") + biff12_wide_string(sheet_name))
+            )
+            relationships.append(
+                f'<Relationship Id="rId{sheet_number}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{sheet_number}.bin"/>'
+            )
+            xlsb_zip.writestr(f"xl/worksheets/sheet{sheet_number}.bin", worksheet)
+        workbook_records.extend([biff12_record(0x0190), biff12_record(0x0184)])
+        xlsb_zip.writestr("xl/workbook.bin", b"".join(workbook_records))
+        relationships.append(
+            f'<Relationship Id="rId{len(worksheets) + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.bin"/>'
+        )
+        xlsb_zip.writestr(
+            "xl/_rels/workbook.bin.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(relationships)
+            + "</Relationships>",
+        )
+        xlsb_zip.writestr(
+            "xl/styles.bin",
+            biff12_record(0x0296)
+            + biff12_record(0x04E9, struct.pack("<I", 2))
+            + b"".join(
+                biff12_record(0x002F, struct.pack("<HHHHHBBHBB", 0, number_format, 0, 0, 0, 0, 0, 0, 0, 0))
+                for number_format in (0, 22)
+            )
+            + biff12_record(0x04EA)
+            + biff12_record(0x0297),
+        )
+        xlsb_zip.writestr(
+            "xl/sharedStrings.bin",
+            biff12_record(0x019F, struct.pack("<II", len(shared_strings), len(shared_strings)))
+            + b"".join(biff12_record(0x0013, b"\x00" + biff12_wide_string(value)) for value in shared_strings)
+            + biff12_record(0x01A0),
+        )
+    return xlsb_file
@@ -2,16 +2,52 @@
 # IMPORTS
 # standard
 from alive_progress import alive_bar
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+)
+from datetime import (
+    date,
+    time as time_of_day,
+    timedelta,
+)
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import posixpath
+import shutil
+import time
+import xml.etree.ElementTree as ET
+import zipfile
 from pathlib import Path
 from io import TextIOWrapper
-# third-party
-from pyxlsb import (
-    open_workbook,
-    Workbook,
-    Worksheet,
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Literal,
 )
+# third-party
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyxlsb import biff12
+from pyxlsb.reader import BIFF12Reader
 # local
+from helpers.polars_queries import (
+    cast_excel_1900_date_system_datetime,
+    financial_year,
+)
+from helpers.sheet_readers import (
+    SHEET_READER_BACKENDS,
+    SheetReaderBackend,
+    excel_1900_date_system_serial,
+    select_sheet_reader_backend,
+)
 
 
 # %%
@@ -41,6 +77,9 @@ PIPELINE_LAYER_RELATIVE_DIRECTORIES: tuple[str, ...] = (
     "03_Output",
 )
 
+# long format traces dataset written to each scenario's Primary layer directory
+LONG_TRACES_DATASET_NAME: str = "interval_demand_long"
+
 PIPELINE_RAW_FILES: dict[str, str] = {
     "POE10_Low": "Interval demand data - 2023-24 to 2032-33 - POE10 - Low.xlsb",
     "POE10_Expected": "Interval demand data - 2023-24 to 2032-33 - POE10 - Expected.xlsb",
@@ -54,6 +93,18 @@ PIPELINE_RAW_FILES: dict[str, str] = {
 # Options: None, "POE10 - Low", "POE10 - Expected", "POE10 - High"
 PIPELINES_SELECTED: str | list[str] | None = None
 
+# worker processes converting sheets in parallel, pyxlsb decoding pins one core per sheet
+# None will use one worker per CPU, 1 will convert sheets serially in this process
+SHEET_CONVERSION_MAX_WORKERS: int | None = None
+
+# rows per checkpointed part file, so an interrupted conversion resumes from its last part rather than the sheet's start
+# None will convert each sheet in one go
+SHEET_CONVERSION_CHUNK_ROWS: int | None = 100_000
+
+# backend reading the workbooks' sheets, one of SHEET_READER_BACKENDS
+# None will use the fastest installed backend measured by `benchmark_sheet_reader_backends` (see `sheet_reader_backend_preference`)
+SHEET_READER_BACKEND: str | None = None
+
 
 # %%
 # VALIDATE CONFIGURATION
@@ -151,96 +202,917 @@ def get_csv_save_directory(
     return csv_save_directory
 
 
-# TODO: refactor this to use pandas read_excel
+def _iter_xlsb_part_records(xlsb_zip: zipfile.ZipFile, part_name: str) -> Iterator[tuple[int, Any]]:
+    """Stream the BIFF12 records of one workbook part, decompressing only as far as they are read."""
+    part_file: zipfile.ZipExtFile
+    with xlsb_zip.open(part_name) as part_file:
+        yield from BIFF12Reader(fp=part_file)
+
+
+def probe_xlxb_workbook(
+    excel_file_filepath: str,
+    header_rows: int = 1,
+) -> pl.DataFrame:
+    """
+    Probe an xlxb workbook's sheets without converting them, one row per
+    sheet with its name, used range (from the sheet's dimension record),
+    uncompressed size in bytes and the values of its first `header_rows`
+    rows as strings. Only the workbook's sheet index, the start of each
+    sheet up to its header rows and the shared strings those headers
+    reference are read, so probing takes milliseconds however large the
+    sheets are.
+    """
+    sheets_metadata: list[dict[str, Any]] = []
+    xlsb_zip: zipfile.ZipFile
+    with zipfile.ZipFile(excel_file_filepath) as xlsb_zip:
+        relationship_targets: dict[str, str] = {
+            relationship.attrib["Id"]: relationship.attrib["Target"]
+            for relationship in ET.fromstring(xlsb_zip.read("xl/_rels/workbook.bin.rels"))
+        }
+        record_type: int
+        record: Any
+        for record_type, record in _iter_xlsb_part_records(xlsb_zip, "xl/workbook.bin"):
+            if record_type == biff12.SHEET:
+                target: str = relationship_targets[record.rId]
+                sheets_metadata.append(
+                    {
+                        "sheet_index": len(sheets_metadata),
+                        "sheet_name": record.name,
+                        "part_name": target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target)),
+                    }
+                )
+            elif record_type == biff12.SHEETS_END:
+                break
+
+        # shared string indices of header cells, resolved once all sheets are probed
+        shared_string_indices: set[int] = set()
+        sheet_metadata: dict[str, Any]
+        for sheet_metadata in sheets_metadata:
+            dimension: Any = None
+            header_cells: list[list[tuple[int, Any, bool]]] = []
+            for record_type, record in _iter_xlsb_part_records(xlsb_zip, sheet_metadata["part_name"]):
+                if record_type == biff12.DIMENSION:
+                    dimension = record
+                elif record_type == biff12.ROW:
+                    if record.r >= header_rows:
+                        break
+                    header_cells.extend([] for _ in range(record.r + 1 - len(header_cells)))
+                elif biff12.BLANK <= record_type <= biff12.FORMULA_BOOLERR and header_cells:
+                    is_shared_string: bool = record_type == biff12.STRING
+                    header_cells[-1].append((record.c, record.v, is_shared_string))
+                    if is_shared_string:
+                        shared_string_indices.add(record.v)
+                elif record_type in (biff12.SHEETDATA_END, biff12.WORKSHEET_END):
+                    break
+            header_cells.extend([] for _ in range(header_rows - len(header_cells)))
+            sheet_metadata.update(
+                {
+                    "first_row": dimension.r if dimension else None,
+                    "last_row": dimension.r + dimension.h - 1 if dimension else None,
+                    "first_column": dimension.c if dimension else None,
+                    "last_column": dimension.c + dimension.w - 1 if dimension else None,
+                    "rows": dimension.h if dimension else 0,
+                    "columns": dimension.w if dimension else 0,
+                    "part_bytes": xlsb_zip.getinfo(sheet_metadata["part_name"]).file_size,
+                    "header_cells": header_cells,
+                }
+            )
+
+        # shared strings are stored in index order, so reading stops at the last one referenced
+        shared_strings: list[str] = []
+        if shared_string_indices:
+            for record_type, record in _iter_xlsb_part_records(xlsb_zip, "xl/sharedStrings.bin"):
+                if record_type == biff12.SI:
+                    shared_strings.append(record.t)
+                    if len(shared_strings) > max(shared_string_indices):
+                        break
+                elif record_type == biff12.SST_END:
+                    break
+
+    for sheet_metadata in sheets_metadata:
+        header_values: list[list[str]] = []
+        for row_cells in sheet_metadata.pop("header_cells"):
+            row_values: list[str] = [""] * (max((column for column, _, _ in row_cells), default=-1) + 1)
+            for column, value, is_shared_string in row_cells:
+                if is_shared_string:
+                    row_values[column] = shared_strings[value] if value < len(shared_strings) else ""
+                elif value is not None:
+                    row_values[column] = str(value)
+            header_values.append(row_values)
+        sheet_metadata["header_rows"] = header_values
+    return pl.DataFrame(
+        sheets_metadata,
+        schema={
+            "sheet_index": pl.Int32,
+            "sheet_name": pl.Utf8,
+            "part_name": pl.Utf8,
+            "first_row": pl.Int64,
+            "last_row": pl.Int64,
+            "first_column": pl.Int64,
+            "last_column": pl.Int64,
+            "rows": pl.Int64,
+            "columns": pl.Int64,
+            "part_bytes": pl.Int64,
+            "header_rows": pl.List(pl.List(pl.Utf8)),
+        },
+    )
+
+
+def _write_sheet_to_csv(
+    rows: Iterator[list[Any]],
+    sheet_name: str,
+    output_filepath: str,
+) -> str:
+    """Write the rows of one workbook sheet to a CSV file. Returns the CSV filepath."""
+    csv_file: TextIOWrapper
+    with open(output_filepath, "w") as csv_file:
+        for values in rows:
+            csv_line = ",".join(
+                str(v) if v is not None else "" for v in values)
+            csv_file.write(csv_line + "\n")
+    return output_filepath
+
+
+def _commit_csv_part(
+    parts_directory: Path,
+    journal: dict[str, Any],
+    csv_lines: list[str],
+) -> None:
+    """Write the next numbered part file atomically, then record it in the progress journal."""
+    part_filepath: Path = parts_directory / f"part-{len(journal['committed_parts']):05d}.csv"
+    temporary_part_filepath: Path = part_filepath.with_suffix(".csv.tmp")
+    temporary_part_filepath.write_text("".join(csv_lines))
+    os.replace(temporary_part_filepath, part_filepath)
+    journal["committed_parts"].append({"filename": part_filepath.name, "rows": len(csv_lines)})
+    temporary_journal_filepath: Path = parts_directory / "journal.json.tmp"
+    temporary_journal_filepath.write_text(json.dumps(journal, indent=4))
+    os.replace(temporary_journal_filepath, parts_directory / "journal.json")
+
+
+def _write_sheet_to_csv_parts(
+    rows: Iterator[list[Any]],
+    sheet_name: str,
+    output_filepath: str,
+    chunk_rows: int = 100_000,
+) -> str:
+    """
+    Write the rows of one workbook sheet to a CSV file, checkpointing
+    every `chunk_rows` rows as a numbered part file in `{output_filepath}.parts`
+    recorded in a progress journal. If a previous attempt was interrupted,
+    conversion resumes after its last committed part: earlier rows are still
+    decoded, since sheets can only be read from their start, but are not
+    formatted or written again. The parts are concatenated into
+    `output_filepath` once the sheet is complete. Returns the CSV filepath.
+    """
+    parts_directory: Path = Path(f"{output_filepath}.parts")
+    parts_directory.mkdir(parents=True, exist_ok=True)
+    journal_filepath: Path = parts_directory / "journal.json"
+    journal: dict[str, Any] = json.loads(journal_filepath.read_text()) if journal_filepath.exists() else {}
+    if journal.get("sheet_name") != sheet_name or journal.get("chunk_rows") != chunk_rows:
+        journal = {"sheet_name": sheet_name, "chunk_rows": chunk_rows, "committed_parts": []}
+    committed_rows: int = sum(committed_part["rows"] for committed_part in journal["committed_parts"])
+    if committed_rows:
+        logging.info(f"Resuming sheet '{sheet_name}' after {committed_rows} committed rows")
+
+    csv_lines: list[str] = []
+    row_index: int
+    for row_index, values in enumerate(rows):
+        if row_index < committed_rows:
+            continue
+        csv_lines.append(",".join(str(v) if v is not None else "" for v in values) + "\n")
+        if len(csv_lines) == chunk_rows:
+            _commit_csv_part(parts_directory, journal, csv_lines)
+            csv_lines = []
+    if csv_lines:
+        _commit_csv_part(parts_directory, journal, csv_lines)
+
+    csv_file: TextIOWrapper
+    with open(output_filepath, "w") as csv_file:
+        for committed_part in journal["committed_parts"]:
+            part_file: TextIOWrapper
+            with open(parts_directory / committed_part["filename"]) as part_file:
+                shutil.copyfileobj(part_file, csv_file)
+    shutil.rmtree(parts_directory)
+    return output_filepath
+
+
+TypedFileFormat = Literal["parquet", "ipc"]
+
+
+def _sheet_column_names(header_values: list[Any]) -> list[str]:
+    """Column names from a sheet's header row, naming blank headers by position and suffixing duplicates."""
+    column_names: list[str] = []
+    column_index: int
+    header_value: Any
+    for column_index, header_value in enumerate(header_values):
+        column_name: str = str(header_value).strip() if header_value not in (None, "") else f"column_{column_index}"
+        if column_name in column_names:
+            column_name = f"{column_name}_{column_index}"
+        column_names.append(column_name)
+    return column_names
+
+
+def _typed_sheet_batch(
+    values: np.ndarray,
+    column_names: list[str],
+    datetime_column_indices: tuple[int, ...],
+) -> pa.Table:
+    """A float64 batch of sheet rows as an arrow table, with Excel serial date columns converted to datetimes."""
+    return (
+        pl.DataFrame(values, schema=column_names, orient="row")
+        .fill_nan(None)
+        .with_columns(
+            cast_excel_1900_date_system_datetime(column_names[column_index]).alias(column_names[column_index])
+            for column_index in datetime_column_indices
+            if column_index < len(column_names)
+        )
+        .to_arrow()
+    )
+
+
+def _write_sheet_to_typed_file(
+    rows: Iterator[list[Any]],
+    sheet_name: str,
+    output_filepath: str,
+    file_format: TypedFileFormat = "parquet",
+    header_row_index: int = 0,
+    first_data_row_index: int | None = None,
+    datetime_column_indices: tuple[int, ...] = (0,),
+    batch_rows: int = 100_000,
+) -> str:
+    """
+    Write the rows of one workbook sheet to a Parquet or Arrow IPC file,
+    buffering rows into float64 batches written as one row group (or record
+    batch) each. Dates and times are stored as Excel serials; other
+    non-numeric data cells become nulls and their count is logged.
+    Returns the filepath.
+    """
+    first_data_row_index = first_data_row_index if first_data_row_index is not None else header_row_index + 1
+    column_names: list[str] = []
+    batch: np.ndarray = np.empty((0, 0))
+    batch_row_count: int = 0
+    dropped_values_count: int = 0
+    writer: pq.ParquetWriter | pa.ipc.RecordBatchFileWriter | None = None
+
+    def write_batch(batch_values: np.ndarray) -> None:
+        nonlocal writer
+        table: pa.Table = _typed_sheet_batch(batch_values, column_names, datetime_column_indices)
+        if writer is None:
+            writer = (
+                pq.ParquetWriter(output_filepath, table.schema, compression="zstd")
+                if file_format == "parquet"
+                else pa.ipc.new_file(output_filepath, table.schema)
+            )
+        writer.write_table(table)
+
+    row_index: int
+    for row_index, values in enumerate(rows):
+        if row_index == header_row_index:
+            column_names = _sheet_column_names(values)
+            batch = np.empty((batch_rows, len(column_names)), dtype=np.float64)
+        elif row_index >= first_data_row_index:
+            typed_values: list[float] = []
+            for value in values:
+                if isinstance(value, float):
+                    typed_values.append(value)
+                elif isinstance(value, (date, time_of_day, timedelta)):
+                    typed_values.append(excel_1900_date_system_serial(value))
+                else:
+                    typed_values.append(np.nan)
+                    dropped_values_count += value is not None
+            batch[batch_row_count] = typed_values
+            batch_row_count += 1
+            if batch_row_count == batch_rows:
+                write_batch(batch)
+                batch_row_count = 0
+    # the last partial batch, or an empty table so sheets without data rows still get a file
+    if batch_row_count > 0 or writer is None:
+        write_batch(batch[:batch_row_count])
+    assert writer is not None
+    writer.close()
+    if dropped_values_count > 0:
+        logging.warning(f"Sheet '{sheet_name}': {dropped_values_count} non-numeric data cells written as nulls")
+    return output_filepath
+
+
+def _write_sheet_atomically(
+    workbook: Any,
+    reader_backend: str,
+    write_sheet: Callable[..., str],
+    sheet_name: str,
+    output_filepath: str,
+    **write_sheet_kwargs,
+) -> str:
+    """Write a sheet to a temporary file renamed over `output_filepath` once complete, so outputs are never partial."""
+    temporary_output_filepath: str = f"{output_filepath}.tmp"
+    write_sheet(
+        rows=SHEET_READER_BACKENDS[reader_backend]["iter_sheet_rows"](workbook, sheet_name),
+        sheet_name=sheet_name,
+        output_filepath=temporary_output_filepath,
+        **write_sheet_kwargs,
+    )
+    os.replace(temporary_output_filepath, output_filepath)
+    return output_filepath
+
+
+# workbooks opened by each sheet conversion worker process, so each is opened (and its shared strings parsed) once per worker
+_worker_workbooks: dict[tuple[str, str], Any] = {}
+
+
+def _write_sheet_in_worker(
+    excel_file_filepath: str,
+    reader_backend: str,
+    write_sheet: Callable[..., str],
+    **write_sheet_kwargs,
+) -> str:
+    if (reader_backend, excel_file_filepath) not in _worker_workbooks:
+        _worker_workbooks[(reader_backend, excel_file_filepath)] = SHEET_READER_BACKENDS[reader_backend]["open_workbook"](excel_file_filepath)
+    return _write_sheet_atomically(
+        workbook=_worker_workbooks[(reader_backend, excel_file_filepath)],
+        reader_backend=reader_backend,
+        write_sheet=write_sheet,
+        **write_sheet_kwargs,
+    )
+
+
+def _remove_partial_outputs(output_filepath: str) -> None:
+    """Remove the temporary file or checkpointed parts left by an interrupted conversion of `output_filepath`."""
+    partial_output_path: Path
+    for partial_output_path in Path(output_filepath).parent.glob(f"{Path(output_filepath).name}.tmp*"):
+        if partial_output_path.is_dir():
+            shutil.rmtree(partial_output_path)
+        else:
+            partial_output_path.unlink()
+
+
+CONVERSION_MANIFEST_FILENAME: str = ".xlxb_conversion_manifest.json"
+
+
+def _file_sha256(filepath: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for file_chunk in iter(lambda: file.read(2 ** 20), b""):
+            file_hash.update(file_chunk)
+    return file_hash.hexdigest()
+
+
+def _output_fingerprint(output_filepath: str) -> dict[str, int] | None:
+    """Size and modification time of an output file, or None if it does not exist."""
+    if not Path(output_filepath).exists():
+        return None
+    output_stat: os.stat_result = Path(output_filepath).stat()
+    return {"size_bytes": output_stat.st_size, "modified_nanoseconds": output_stat.st_mtime_ns}
+
+
+def _read_conversion_manifest(save_directory: str) -> dict[str, dict[str, Any]]:
+    manifest_filepath: Path = Path(save_directory) / CONVERSION_MANIFEST_FILENAME
+    return json.loads(manifest_filepath.read_text()) if manifest_filepath.exists() else {}
+
+
+def _write_conversion_manifest(save_directory: str, manifest: dict[str, dict[str, Any]]) -> None:
+    manifest_filepath: Path = Path(save_directory) / CONVERSION_MANIFEST_FILENAME
+    temporary_manifest_filepath: Path = manifest_filepath.with_suffix(".json.tmp")
+    temporary_manifest_filepath.write_text(json.dumps(manifest, indent=4))
+    os.replace(temporary_manifest_filepath, manifest_filepath)
+
+
+def _convert_xlxb_excel_files_sheets(
+    excel_files: dict[str, tuple[str, str]],
+    file_extension: str,
+    write_sheet: Callable[..., str],
+    max_workers: int | None = 1,
+    force: bool = False,
+    reader_backend: str | None = None,
+    **write_sheet_kwargs,
+) -> dict[str, list[str]]:
+    """
+    Write every sheet of each xlxb Excel file to `{save_directory}/{sheet_name}.{file_extension}`
+    with `write_sheet`, where `excel_files` maps a name to an
+    `(excel_file_filepath, save_directory)` pair. Returns each name's output
+    filepaths in sheet order.
+
+    A manifest in each save directory records, per output, the workbook's
+    SHA-256, the sheet name, the conversion options and the output's size
+    and modification time. Unless `force` is True, sheets whose manifest
+    entry still matches are skipped. Outputs are written to a temporary
+    file and renamed into place, and the manifest is updated as each sheet
+    completes, so an interrupted run only redoes unfinished sheets. Partial
+    outputs of an unfinished sheet are kept for `write_sheet` to resume from
+    if the workbook and options are unchanged, and removed otherwise.
+
+    With `max_workers` other than 1 (None for one per CPU), the sheets of
+    all files share one pool of worker processes. Each worker opens a
+    workbook independently the first time it converts one of its sheets
+    and takes the next unconverted sheet, from any file, when it finishes
+    one, with a single progress bar across all workers. Sheets are queued
+    largest first, sized by `probe_xlxb_workbook`.
+
+    Workbooks are read with `reader_backend`, by default the fastest
+    installed one (see `select_sheet_reader_backend`).
+    """
+    reader_backend = select_sheet_reader_backend(reader_backend)
+    sheet_reader_backend: SheetReaderBackend = SHEET_READER_BACKENDS[reader_backend]
+    # round-tripped through JSON so options compare equal to those read back from a manifest
+    conversion_options: dict[str, Any] = json.loads(
+        json.dumps(
+            {
+                "write_sheet": write_sheet.__name__,
+                "file_extension": file_extension,
+                "reader_backend": reader_backend,
+                **write_sheet_kwargs,
+            }
+        )
+    )
+    sheets_names: dict[str, list[str]] = {}
+    output_filepaths: dict[str, list[str]] = {}
+    manifests: dict[str, dict[str, dict[str, Any]]] = {}
+    # (name, sheet name, output filepath, manifest entry once converted) for every sheet not up to date
+    pending_sheets: list[tuple[str, str, str, dict[str, Any]]] = []
+    name: str
+    excel_file_filepath: str
+    save_directory: str
+    for name, (excel_file_filepath, save_directory) in excel_files.items():
+        workbook: Any = sheet_reader_backend["open_workbook"](excel_file_filepath)
+        try:
+            sheets_names[name] = sheet_reader_backend["sheet_names"](workbook)
+        finally:
+            workbook.close()
+        output_filepaths[name] = [
+            f"{save_directory}/{sheet_name}.{file_extension}"
+            for sheet_name in sheets_names[name]
+        ]
+        Path(save_directory).mkdir(parents=True, exist_ok=True)
+        manifests[save_directory] = manifests.get(save_directory) or _read_conversion_manifest(save_directory)
+        workbook_sha256: str = _file_sha256(excel_file_filepath)
+        for sheet_name, output_filepath in zip(sheets_names[name], output_filepaths[name]):
+            manifest_entry: dict[str, Any] = {
+                "workbook_filepath": excel_file_filepath,
+                "workbook_sha256": workbook_sha256,
+                "sheet_name": sheet_name,
+                "conversion_options": conversion_options,
+            }
+            existing_manifest_entry: dict[str, Any] = manifests[save_directory].get(Path(output_filepath).name, {})
+            is_up_to_date: bool = (
+                existing_manifest_entry.get("output_fingerprint") is not None
+                and existing_manifest_entry == {**manifest_entry, "output_fingerprint": _output_fingerprint(output_filepath)}
+            )
+            if force or not is_up_to_date:
+                # an interrupted conversion of the same workbook with the same options may resume from its partial output
+                is_resumable: bool = not force and existing_manifest_entry == {**manifest_entry, "output_fingerprint": None}
+                if not is_resumable:
+                    _remove_partial_outputs(output_filepath)
+                manifests[save_directory][Path(output_filepath).name] = {**manifest_entry, "output_fingerprint": None}
+                pending_sheets.append((name, sheet_name, output_filepath, manifest_entry))
+        _write_conversion_manifest(save_directory, manifests[save_directory])
+    sheets_count: int = sum(len(names) for names in sheets_names.values())
+    logging.info(f"Skipping {sheets_count - len(pending_sheets)} of {sheets_count} sheets already up to date")
+
+    def record_converted_sheet(name: str, output_filepath: str, manifest_entry: dict[str, Any]) -> None:
+        save_directory: str = excel_files[name][1]
+        manifests[save_directory][Path(output_filepath).name] = {
+            **manifest_entry,
+            "output_fingerprint": _output_fingerprint(output_filepath),
+        }
+        _write_conversion_manifest(save_directory, manifests[save_directory])
+
+    workers_count: int = min(max_workers or os.cpu_count() or 1, len(pending_sheets))
+    progress_bar_title: str = (
+        f"Processing sheets in Excel '{Path(next(iter(excel_files.values()))[0]).name}'"
+        if len(excel_files) == 1
+        else f"Processing sheets in {len(excel_files)} Excel files"
+    )
+    sheet_name: str
+    output_filepath: str
+    manifest_entry: dict[str, Any]
+    with alive_bar(len(pending_sheets), title=progress_bar_title) as bar:
+        if workers_count <= 1:
+            open_workbooks: dict[str, Any] = {}
+            try:
+                for name, sheet_name, output_filepath, manifest_entry in pending_sheets:
+                    excel_file_filepath = excel_files[name][0]
+                    if excel_file_filepath not in open_workbooks:
+                        open_workbooks[excel_file_filepath] = sheet_reader_backend["open_workbook"](excel_file_filepath)
+                    _write_sheet_atomically(
+                        workbook=open_workbooks[excel_file_filepath],
+                        reader_backend=reader_backend,
+                        write_sheet=write_sheet,
+                        sheet_name=sheet_name,
+                        output_filepath=output_filepath,
+                        **write_sheet_kwargs,
+                    )
+                    record_converted_sheet(name, output_filepath, manifest_entry)
+                    bar()
+            finally:
+                for workbook in open_workbooks.values():
+                    workbook.close()
+        elif pending_sheets:
+            logging.debug(f"Converting {len(pending_sheets)} sheets in {len(excel_files)} Excel files with {workers_count} worker processes")
+            # largest sheets first, so the longest conversions do not start last while other workers sit idle
+            sheet_part_bytes: dict[tuple[str, str], int] = {
+                (name, sheet_name): part_bytes
+                for name in {pending_sheet[0] for pending_sheet in pending_sheets}
+                for sheet_name, part_bytes in (
+                    probe_xlxb_workbook(excel_files[name][0], header_rows=0)
+                    .select("sheet_name", "part_bytes")
+                    .iter_rows()
+                )
+            }
+            pending_sheets.sort(key=lambda pending_sheet: sheet_part_bytes.get(pending_sheet[:2], 0), reverse=True)
+            executor: ProcessPoolExecutor
+            # spawned rather than forked workers, as forking a process with polars' thread pool running can deadlock
+            with ProcessPoolExecutor(max_workers=workers_count, mp_context=multiprocessing.get_context("spawn")) as executor:
+                sheet_conversions: dict[Future, tuple[str, str, str, dict[str, Any]]] = {
+                    executor.submit(
+                        _write_sheet_in_worker,
+                        excel_file_filepath=excel_files[pending_sheet[0]][0],
+                        reader_backend=reader_backend,
+                        write_sheet=write_sheet,
+                        sheet_name=pending_sheet[1],
+                        output_filepath=pending_sheet[2],
+                        **write_sheet_kwargs,
+                    ): pending_sheet
+                    for pending_sheet in pending_sheets
+                }
+                sheet_conversion: Future
+                for sheet_conversion in as_completed(sheet_conversions):
+                    try:
+                        sheet_conversion.result()
+                    except BaseException:
+                        # a failed sheet fails the run, so sheets not yet started are not converted only to be discarded
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise
+                    name, _, output_filepath, manifest_entry = sheet_conversions[sheet_conversion]
+                    record_converted_sheet(name, output_filepath, manifest_entry)
+                    bar()
+    logging.debug(f"Sheets processed: {sheets_names}")
+    return output_filepaths
+
+
+def _csv_sheet_writer(chunk_rows: int | None) -> dict[str, Any]:
+    """`write_sheet` and its options for CSV output, checkpointed into parts if `chunk_rows` is given."""
+    if chunk_rows is None:
+        return {"write_sheet": _write_sheet_to_csv}
+    return {"write_sheet": _write_sheet_to_csv_parts, "chunk_rows": chunk_rows}
+
+
 def split_xlxb_excel_tabs_to_csv(
     excel_file_filepath: str,
     csv_save_directory: str,
+    max_workers: int | None = 1,
+    force: bool = False,
+    chunk_rows: int | None = None,
+    reader_backend: str | None = None,
 ) -> list[str]:
     """
     Converts an xlxb Excel file with multiple sheets into multiple CSV files,
     with each CSV named after the corresponding Excel sheet. Returns a list
-    of the CSV filepaths.
+    of the CSV filepaths. Sheets are converted in parallel worker processes
+    if `max_workers` is not 1, and sheets already converted from an
+    unchanged workbook are skipped unless `force` is True. With
+    `chunk_rows`, each sheet is checkpointed every `chunk_rows` rows, so a
+    rerun after an interruption resumes from the last committed chunk.
+    Sheets are read with `reader_backend`, by default the fastest installed.
     """
-    csv_save_filepaths: list[str] = []
-    wb: Workbook
-    with open_workbook(excel_file_filepath) as wb:
-        sheets_names: list[str] = wb.sheets
-        sheet_name: str
-        with alive_bar(len(sheets_names), title=f"Processing sheets in Excel '{Path(excel_file_filepath).name}'") as bar:
-            for sheet_name in sheets_names:
-                sheet: Worksheet
-                with wb.get_sheet(sheet_name) as sheet:
-                    csv_save_filepath: str = f"{csv_save_directory}/{sheet_name}.csv"
-                    csv_save_filepaths.append(csv_save_filepath)
-                    csv_file: TextIOWrapper
-                    with open(csv_save_filepath, "a") as csv_file:
-                        for row in sheet.rows():
-                            # retrieving content, too bespoke to typehint
-                            values = [r.v for r in row]
-                            csv_line = ",".join(
-                                str(v) if v is not None else "" for v in values)
-                            csv_file.write(csv_line + "\n")
-                        bar()
-    logging.debug(f"Sheets processed: {sheets_names}")
-    return csv_save_filepaths
+    return _convert_xlxb_excel_files_sheets(
+        excel_files={excel_file_filepath: (excel_file_filepath, csv_save_directory)},
+        file_extension="csv",
+        max_workers=max_workers,
+        force=force,
+        reader_backend=reader_backend,
+        **_csv_sheet_writer(chunk_rows),
+    )[excel_file_filepath]
+
+
+def convert_xlxb_excel_tabs_to_typed_files(
+    excel_file_filepath: str,
+    save_directory: str,
+    file_format: TypedFileFormat = "parquet",
+    header_row_index: int = 0,
+    first_data_row_index: int | None = None,
+    datetime_column_indices: tuple[int, ...] = (0,),
+    batch_rows: int = 100_000,
+    max_workers: int | None = 1,
+    force: bool = False,
+    reader_backend: str | None = None,
+) -> list[str]:
+    """
+    Converts an xlxb Excel file with multiple sheets into one typed Parquet
+    or Arrow IPC file per sheet, so downstream consumers skip re-parsing
+    CSV text. Columns are named from the `header_row_index` row and data
+    starts at `first_data_row_index` (default the row after the header).
+    Trace columns are float64 and the `datetime_column_indices` columns are
+    converted from Excel 1900 date system serials to datetimes. Sheets
+    already converted from an unchanged workbook with the same options are
+    skipped unless `force` is True. Returns a list of the output filepaths.
+    """
+    return _convert_xlxb_excel_files_sheets(
+        excel_files={excel_file_filepath: (excel_file_filepath, save_directory)},
+        file_extension="arrow" if file_format == "ipc" else file_format,
+        write_sheet=_write_sheet_to_typed_file,
+        max_workers=max_workers,
+        force=force,
+        reader_backend=reader_backend,
+        file_format=file_format,
+        header_row_index=header_row_index,
+        first_data_row_index=first_data_row_index,
+        datetime_column_indices=datetime_column_indices,
+        batch_rows=batch_rows,
+    )[excel_file_filepath]
+
+
+def benchmark_xlxb_conversion_formats(
+    excel_file_filepath: str,
+    save_directory: str,
+    header_row_index: int = 0,
+    first_data_row_index: int | None = None,
+    repeat_runs: int = 3,
+) -> pl.DataFrame:
+    """
+    Benchmark converting an xlxb Excel file to CSV, Parquet and Arrow IPC,
+    end to end from the workbook to every sheet loaded as a polars
+    dataframe, plus the total size of each format's output files. Each
+    format is written to its own subdirectory of `save_directory`.
+    """
+    converters: dict[str, Callable[[str], list[str]]] = {
+        "csv": lambda output_directory: split_xlxb_excel_tabs_to_csv(excel_file_filepath, output_directory),
+        "parquet": lambda output_directory: convert_xlxb_excel_tabs_to_typed_files(
+            excel_file_filepath, output_directory, "parquet", header_row_index, first_data_row_index,
+        ),
+        "ipc": lambda output_directory: convert_xlxb_excel_tabs_to_typed_files(
+            excel_file_filepath, output_directory, "ipc", header_row_index, first_data_row_index,
+        ),
+    }
+    first_data_row_index = first_data_row_index if first_data_row_index is not None else header_row_index + 1
+    loaders: dict[str, Callable[[str], pl.DataFrame]] = {
+        "csv": lambda filepath: pl.read_csv(
+            filepath,
+            has_header=False,
+            skip_rows=first_data_row_index,
+            infer_schema_length=10_000,
+            truncate_ragged_lines=True,
+        ),
+        "parquet": pl.read_parquet,
+        "ipc": pl.read_ipc,
+    }
+
+    benchmark_results: list[dict[str, Any]] = []
+    file_format: str
+    for file_format, convert in converters.items():
+        output_directory: Path = Path(save_directory) / file_format
+        for _ in range(repeat_runs):
+            # a previous run's manifest would skip every up-to-date sheet and its
+            # checkpointed parts directories would be resumed, so every run starts from an empty directory
+            shutil.rmtree(output_directory, ignore_errors=True)
+            output_directory.mkdir(parents=True)
+            start_time: float = time.perf_counter()
+            output_filepaths: list[str] = convert(output_directory.as_posix())
+            convert_seconds: float = time.perf_counter() - start_time
+            for output_filepath in output_filepaths:
+                loaders[file_format](output_filepath)
+            benchmark_results.append(
+                {
+                    "file_format": file_format,
+                    "convert_seconds": convert_seconds,
+                    "end_to_end_seconds": time.perf_counter() - start_time,
+                    "output_bytes": sum(Path(output_filepath).stat().st_size for output_filepath in output_filepaths),
+                }
+            )
+    return (
+        pl.DataFrame(benchmark_results)
+        .group_by("file_format", maintain_order=True)
+        .agg(
+            pl.col("convert_seconds").median(),
+            pl.col("end_to_end_seconds").median(),
+            pl.col("output_bytes").first().truediv(1024 ** 2).alias("output_mebibytes"),
+        )
+        .sort("end_to_end_seconds")
+    )
+
+
+def _scan_converted_sheet(converted_filepath: str, header_row_index: int = 0) -> pl.LazyFrame:
+    """Lazily scan a sheet converted to CSV, Parquet or Arrow IPC."""
+    if converted_filepath.endswith(".parquet"):
+        return pl.scan_parquet(converted_filepath)
+    if converted_filepath.endswith(".arrow"):
+        return pl.scan_ipc(converted_filepath)
+    return pl.scan_csv(converted_filepath, skip_rows=header_row_index, infer_schema_length=10_000, truncate_ragged_lines=True)
+
+
+LONG_TRACES_SCHEMA: dict[str, pl.PolarsDataType] = {
+    "timestamp": pl.Datetime("us"),
+    "trace": pl.Utf8,
+    "component": pl.Utf8,
+    "value": pl.Float64,
+    "financial_year": pl.Utf8,
+}
+
+
+def reshape_trace_to_long_by_financial_year(
+    converted_filepath: str,
+    dataset_directory: str,
+    header_row_index: int = 0,
+    timestamp_column_index: int = 0,
+) -> bool:
+    """
+    Unpivot a converted wide trace sheet, one column per component, into
+    long `timestamp, trace, component, value` rows and write them to a
+    Parquet dataset in `dataset_directory` partitioned by financial year,
+    one file per trace and year (`financial_year=2023-24/{trace}.parquet`)
+    so each trace's files are replaced on rerun. Excel serial timestamps
+    are converted to datetimes, and rows without a timestamp, such as
+    units rows, are dropped. Each year is streamed to its file with
+    `sink_parquet`, so the long rows are never held in memory; the sheet
+    is scanned once to find its financial years and once per year. Returns
+    False, writing nothing, if the sheet's timestamp column is neither
+    numeric nor datetime (not a trace).
+    """
+    trace_name: str = Path(converted_filepath).stem
+    wide_trace: pl.LazyFrame = _scan_converted_sheet(converted_filepath, header_row_index)
+    wide_trace_schema: dict[str, pl.PolarsDataType] = dict(wide_trace.schema)
+    timestamp_column: str = list(wide_trace_schema)[timestamp_column_index]
+    timestamp_dtype: pl.PolarsDataType = wide_trace_schema[timestamp_column]
+    if timestamp_dtype in pl.NUMERIC_DTYPES:
+        timestamp: pl.Expr = cast_excel_1900_date_system_datetime(pl.col(timestamp_column).cast(pl.Float64))
+    elif timestamp_dtype in pl.TEMPORAL_DTYPES:
+        timestamp = pl.col(timestamp_column)
+    else:
+        logging.info(f"Skipping '{trace_name}', its timestamp column '{timestamp_column}' is {timestamp_dtype}")
+        return False
+    component_columns: list[str] = [column for column in wide_trace_schema if column != timestamp_column]
+
+    wide_trace_by_financial_year: pl.LazyFrame = (
+        wide_trace
+        .select(
+            timestamp.cast(LONG_TRACES_SCHEMA["timestamp"]).alias("timestamp"),
+            *(pl.col(column).cast(pl.Float64, strict=False) for column in component_columns),
+        )
+        .filter(pl.col("timestamp").is_not_null())
+        .with_columns(financial_year("timestamp").alias("financial_year"))
+    )
+    financial_years: list[str] = (
+        wide_trace_by_financial_year
+        .select(pl.col("financial_year").unique().sort())
+        .collect(streaming=True)
+        .get_column("financial_year")
+        .to_list()
+    )
+
+    partition_directory: Path
+    for partition_directory in Path(dataset_directory).glob("financial_year=*"):
+        (partition_directory / f"{trace_name}.parquet").unlink(missing_ok=True)
+    trace_financial_year: str
+    for trace_financial_year in financial_years:
+        partition_directory = Path(dataset_directory) / f"financial_year={trace_financial_year}"
+        partition_directory.mkdir(parents=True, exist_ok=True)
+        (
+            wide_trace_by_financial_year
+            .filter(pl.col("financial_year") == trace_financial_year)
+            .drop("financial_year")
+            .melt(id_vars="timestamp", variable_name="component", value_name="value")
+            .select(
+                "timestamp",
+                pl.lit(trace_name).alias("trace"),
+                "component",
+                "value",
+            )
+            .sink_parquet(partition_directory / f"{trace_name}.parquet", compression="zstd")
+        )
+    return True
+
+
+def scan_long_traces(
+    dataset_directory: str,
+    first_financial_year: str | None = None,
+    last_financial_year: str | None = None,
+) -> pl.LazyFrame:
+    """
+    Lazily scan the long traces dataset written by
+    `reshape_trace_to_long_by_financial_year` as a hive-partitioned
+    dataset with its `financial_year` column, keeping the years from
+    `first_financial_year` to `last_financial_year` inclusive (e.g.
+    "2025-26"), by default all. The year filter prunes partitions, so
+    year-range queries never open other years' files. An empty dataset
+    scans as an empty frame with `LONG_TRACES_SCHEMA`.
+    """
+    if not any(Path(dataset_directory).glob("financial_year=*/*.parquet")):
+        return pl.LazyFrame(schema=LONG_TRACES_SCHEMA)
+    long_traces: pl.LazyFrame = pl.scan_parquet(
+        f"{dataset_directory}/financial_year=*/*.parquet",
+        hive_partitioning=True,
+        hive_schema={"financial_year": LONG_TRACES_SCHEMA["financial_year"]},
+    )
+    if first_financial_year is not None:
+        long_traces = long_traces.filter(pl.col("financial_year") >= first_financial_year)
+    if last_financial_year is not None:
+        long_traces = long_traces.filter(pl.col("financial_year") <= last_financial_year)
+    return long_traces
 
 
 # %%
 # PROCESS FUNCTIONS
 
-def pipeline_split_xlxb_excel_tabs_to_csv(pipelines_to_process) -> list[str]:
-    """Raw -> Intermediate pipeline layer"""
+def pipeline_split_xlxb_excel_tabs_to_csv(
+    pipelines_to_process: list[str],
+    max_workers: int | None = SHEET_CONVERSION_MAX_WORKERS,
+    chunk_rows: int | None = SHEET_CONVERSION_CHUNK_ROWS,
+    reader_backend: str | None = SHEET_READER_BACKEND,
+) -> dict[str, list[str]]:
+    """
+    Raw -> Intermediate pipeline layer. The scenarios' workbooks are
+    independent, so all their sheets are converted together by one shared
+    pool of `max_workers` worker processes, checkpointed every `chunk_rows`
+    rows. Returns each scenario's CSV filepaths.
+    """
 
     INPUT_DATA_LAYER: str = "Raw"
     OUTPUT_DATA_LAYER: str = "Intermediate"
 
+    logging.info("Getting pipeline layer directories...")
+    pipeline_layer_directories_dictionary: dict[str, str] = get_pipeline_layer_directories(
+        main_directory=MAIN_DIRECTORY,
+        pipeline_layers=PIPELINE_LAYERS,
+        pipeline_layer_relative_directories=PIPELINE_LAYER_RELATIVE_DIRECTORIES,
+    )
+    logging.info("Getting pipeline layer directories...DONE")
+
+    excel_files: dict[str, tuple[str, str]] = {}
     for current_pipeline in pipelines_to_process:
-        logging.info(
-            f"Processing pipeline {current_pipeline}: Raw -> Intermediate...")
-
-        logging.info("Getting pipeline layer directories...")
-        pipeline_layer_directories_dictionary: dict[str, str] = get_pipeline_layer_directories(
-            main_directory=MAIN_DIRECTORY,
-            pipeline_layers=PIPELINE_LAYERS,
-            pipeline_layer_relative_directories=PIPELINE_LAYER_RELATIVE_DIRECTORIES,
+        logging.info(f"Getting Excel file filepath and CSV save directory for pipeline {current_pipeline}...")
+        excel_files[current_pipeline] = (
+            get_excel_file_filepath(
+                pipeline_layer_directory=pipeline_layer_directories_dictionary[INPUT_DATA_LAYER],
+                pipeline_raw_files=PIPELINE_RAW_FILES,
+                current_pipeline=current_pipeline,
+            ),
+            get_csv_save_directory(
+                pipeline_layer_directory=pipeline_layer_directories_dictionary[OUTPUT_DATA_LAYER],
+                current_pipeline=current_pipeline,
+            ),
         )
-        logging.info("Getting pipeline layer directories...DONE")
 
-        logging.info("Getting Excel file filepath...")
-        excel_file_filepath: str = get_excel_file_filepath(
-            pipeline_layer_directory=pipeline_layer_directories_dictionary[INPUT_DATA_LAYER],
-            pipeline_raw_files=PIPELINE_RAW_FILES,
-            current_pipeline=current_pipeline,
-        )
-        logging.info("Getting Excel file filepath...DONE")
+    logging.info(f"Processing pipelines {pipelines_to_process}: Raw -> Intermediate...")
+    csv_save_filepaths: dict[str, list[str]] = _convert_xlxb_excel_files_sheets(
+        excel_files=excel_files,
+        file_extension="csv",
+        max_workers=max_workers,
+        reader_backend=reader_backend,
+        **_csv_sheet_writer(chunk_rows),
+    )
+    logging.info(f"Processing pipelines {pipelines_to_process}: Raw -> Intermediate...DONE")
 
-        logging.info("Getting CSV save directory...")
-        csv_save_directory: str = get_csv_save_directory(
-            pipeline_layer_directory=pipeline_layer_directories_dictionary[OUTPUT_DATA_LAYER],
-            current_pipeline=current_pipeline,
-        )
-        logging.info("Getting CSV save directory...DONE")
+    return csv_save_filepaths
 
-        logging.info("Splitting xlxb Excel file tabs to CSV files...")
-        csv_save_filepaths: list[str] = split_xlxb_excel_tabs_to_csv(
-            excel_file_filepath=excel_file_filepath,
-            csv_save_directory=csv_save_directory,
-        )
-        logging.info("Splitting xlxb Excel file tabs to CSV files...DONE")
 
-        logging.info(
-            f"Processing pipeline {current_pipeline}: Raw -> Intermediate...DONE")
+def pipeline_reshape_traces_to_long_by_financial_year(
+    converted_filepaths: dict[str, list[str]],
+) -> dict[str, str]:
+    """
+    Intermediate -> Primary pipeline layer. Reshapes each scenario's
+    converted trace sheets into one long format Parquet dataset partitioned
+    by financial year. Returns each scenario's dataset directory.
+    """
 
-    return csv_save_filepaths
+    OUTPUT_DATA_LAYER: str = "Primary"
+
+    pipeline_layer_directories_dictionary: dict[str, str] = get_pipeline_layer_directories(
+        main_directory=MAIN_DIRECTORY,
+        pipeline_layers=PIPELINE_LAYERS,
+        pipeline_layer_relative_directories=PIPELINE_LAYER_RELATIVE_DIRECTORIES,
+    )
+
+    dataset_directories: dict[str, str] = {}
+    current_pipeline: str
+    for current_pipeline, current_converted_filepaths in converted_filepaths.items():
+        logging.info(f"Processing pipeline {current_pipeline}: Intermediate -> Primary...")
+        dataset_directories[current_pipeline] = str(
+            Path(
+                get_csv_save_directory(
+                    pipeline_layer_directory=pipeline_layer_directories_dictionary[OUTPUT_DATA_LAYER],
+                    current_pipeline=current_pipeline,
+                )
+            ) / LONG_TRACES_DATASET_NAME
+        )
+        with alive_bar(len(current_converted_filepaths), title=f"Reshaping traces for {current_pipeline}") as bar:
+            for converted_filepath in current_converted_filepaths:
+                reshape_trace_to_long_by_financial_year(
+                    converted_filepath=converted_filepath,
+                    dataset_directory=dataset_directories[current_pipeline],
+                )
+                bar()
+        logging.info(f"Processing pipeline {current_pipeline}: Intermediate -> Primary...DONE")
+
+    return dataset_directories
 
 
 # %%
 # MAIN PROGRAM
 
-def main() -> list[str]:
+def main() -> dict[str, list[str]]:
     """Main program, execute pipelines"""
 
-    csv_save_filepaths: list[str] = pipeline_split_xlxb_excel_tabs_to_csv(pipelines_to_process=PIPELINE_TO_PROCESS)
+    csv_save_filepaths: dict[str, list[str]] = pipeline_split_xlxb_excel_tabs_to_csv(pipelines_to_process=PIPELINE_TO_PROCESS)
+
+    pipeline_reshape_traces_to_long_by_financial_year(converted_filepaths=csv_save_filepaths)
 
     return csv_save_filepaths
 
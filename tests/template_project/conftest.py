@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# pipeline scripts import `helpers` as a top-level package, as when run from `template_project/`
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "template_project"))
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import polars as pl
+import pytest
+from template_project.helpers.polars_queries import (
+    cast_excel_1900_date_system_datetime,
+    financial_year,
+)
+
+
+def test_cast_excel_1900_date_system_datetime_matches_excel_serials():
+    df = pl.DataFrame({"date": [45108.0, 45108.5]})
+    assert df.select(cast_excel_1900_date_system_datetime("date"))["date"].to_list() == [
+        datetime(2023, 7, 1),
+        datetime(2023, 7, 1, 12),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("date", "expected_financial_year"),
+    [
+        (datetime(2023, 6, 30, 23, 30), "2022-23"),
+        (datetime(2023, 7, 1), "2023-24"),
+        (datetime(1999, 12, 31), "1999-00"),
+    ],
+)
+def test_financial_year_starts_in_july(date, expected_financial_year):
+    df = pl.DataFrame({"date": [date]})
+    assert df.select(financial_year("date")).item() == expected_financial_year
+
+
+def test_financial_year_custom_first_month():
+    df = pl.DataFrame({"date": [datetime(2023, 3, 31), datetime(2023, 4, 1)]})
+    assert df.select(financial_year(pl.col("date"), first_month=4)).to_series().to_list() == ["2022-23", "2023-24"]
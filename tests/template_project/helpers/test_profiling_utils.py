@@ -0,0 +1,16 @@
+from template_project.helpers.profiling_utils import PeakRssTracker
+
+
+def test_peak_rss_tracker_records_allocation():
+    with PeakRssTracker(sampling_interval_seconds=0.001) as tracker:
+        allocation = bytearray(64 * 1024 ** 2)
+        allocation[::4096] = b"x" * len(allocation[::4096])  # touch pages so they count towards RSS
+    assert tracker.peak_rss_bytes >= tracker.baseline_rss_bytes
+    assert tracker.peak_rss_increase_bytes >= 32 * 1024 ** 2
+    del allocation
+
+
+def test_peak_rss_tracker_never_negative():
+    with PeakRssTracker() as tracker:
+        pass
+    assert tracker.peak_rss_increase_bytes >= 0
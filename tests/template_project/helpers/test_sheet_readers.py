@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import polars as pl
+from template_project.helpers.sheet_readers import (
+    SHEET_READER_BACKENDS,
+    benchmark_sheet_reader_backends,
+    installed_sheet_reader_backends,
+    select_sheet_reader_backend,
+    sheet_reader_backend_preference,
+)
+from template_project.helpers.xlsb_writer import (
+    biff12_row,
+    biff12_worksheet,
+    write_xlsb,
+)
+
+
+def _write_benchmark_results(filepath, results):
+    pl.DataFrame(
+        results,
+        schema=["reader_backend", "runtime_median_seconds", "benchmarked_at"],
+        orient="row",
+    ).write_parquet(filepath)
+    return filepath.as_posix()
+
+
+def test_sheet_reader_backend_preference_defaults_to_registration_order(tmp_path):
+    assert sheet_reader_backend_preference((tmp_path / "missing.parquet").as_posix()) == tuple(SHEET_READER_BACKENDS)
+
+
+def test_sheet_reader_backend_preference_orders_by_latest_measurement(tmp_path):
+    results_filepath = _write_benchmark_results(
+        tmp_path / "results.parquet",
+        [
+            ("pyxlsb", 1.0, datetime(2024, 1, 1)),
+            ("pandas", 2.0, datetime(2024, 1, 1)),
+            # the latest run of a backend replaces its earlier ones
+            ("pandas", 0.5, datetime(2024, 2, 1)),
+            # backends no longer registered are ignored
+            ("removed_backend", 0.1, datetime(2024, 2, 1)),
+        ],
+    )
+    preference = sheet_reader_backend_preference(results_filepath)
+    assert preference[:2] == ("pandas", "pyxlsb")
+    # unbenchmarked backends follow in registration order
+    assert preference[2:] == tuple(name for name in SHEET_READER_BACKENDS if name not in {"pandas", "pyxlsb"})
+
+
+def test_select_sheet_reader_backend_picks_fastest_installed(tmp_path):
+    installed_backends = installed_sheet_reader_backends()
+    results_filepath = _write_benchmark_results(
+        tmp_path / "results.parquet",
+        [(name, float(len(installed_backends) - index), datetime(2024, 1, 1)) for index, name in enumerate(installed_backends)],
+    )
+    assert select_sheet_reader_backend(results_filepath=results_filepath) == installed_backends[-1]
+    # an explicit backend is used as given
+    assert select_sheet_reader_backend("pyxlsb", results_filepath=results_filepath) == "pyxlsb"
+
+
+def test_benchmark_sheet_reader_backends_records_results(tmp_path):
+    shared_strings = {}
+    rows = [["timestamp", "value"], [datetime(2023, 7, 1), 1.0], [datetime(2023, 7, 1, 0, 30), 2.0]]
+    excel_file_filepath = write_xlsb(
+        (tmp_path / "workbook.xlsb").as_posix(),
+        {
+            sheet_name: biff12_worksheet(
+                [biff12_row(row_index, row, shared_strings) for row_index, row in enumerate(rows)],
+                rows_count=len(rows),
+                columns_count=2,
+            )
+            for sheet_name in ("first", "second")
+        },
+        shared_strings,
+    )
+    results_filepath = (tmp_path / "results" / "sheet_reader_backends.parquet").as_posix()
+
+    benchmark_results = benchmark_sheet_reader_backends(excel_file_filepath, repeat_runs=1, results_filepath=results_filepath)
+    assert sorted(benchmark_results.get_column("reader_backend").to_list()) == sorted(installed_sheet_reader_backends())
+    assert benchmark_results.get_column("rows_read").to_list() == [2 * len(rows)] * benchmark_results.height
+    assert benchmark_results.get_column("runtime_median_seconds").is_sorted()
+
+    # a second run is appended, and the preference follows the measurements
+    benchmark_sheet_reader_backends(excel_file_filepath, repeat_runs=1, results_filepath=results_filepath)
+    assert pl.read_parquet(results_filepath).height == 2 * benchmark_results.height
+    assert set(sheet_reader_backend_preference(results_filepath)) == set(SHEET_READER_BACKENDS)
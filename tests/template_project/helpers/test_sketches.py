@@ -0,0 +1,52 @@
+import numpy as np
+import polars as pl
+import pytest
+from template_project.helpers.sketches import (
+    HyperLogLog,
+    TDigest,
+)
+
+
+@pytest.mark.parametrize("distinct_count", [0, 10, 1_000, 100_000])
+def test_hyperloglog_estimate_within_tolerance(distinct_count):
+    sketch = HyperLogLog()
+    sketch.update(pl.Series([f"{index}." for index in range(distinct_count)] * 2))
+    assert sketch.estimate() == pytest.approx(distinct_count, rel=0.05, abs=1)
+
+
+def test_hyperloglog_merge_matches_single_sketch():
+    values = pl.Series([f"({index})" for index in range(50_000)])
+    merged_sketch, other_sketch, single_sketch = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    merged_sketch.update(values[:30_000])
+    other_sketch.update(values[20_000:])
+    merged_sketch.merge(other_sketch)
+    single_sketch.update(values)
+    assert merged_sketch.estimate() == single_sketch.estimate()
+
+
+def test_hyperloglog_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+@pytest.mark.parametrize("quantile", [0.01, 0.25, 0.5, 0.75, 0.99])
+def test_tdigest_merged_quantiles_within_tolerance(quantile):
+    values = np.random.default_rng(0).lognormal(mean=5, sigma=1, size=200_000)
+    sketch = TDigest()
+    values_chunk: np.ndarray
+    for values_chunk in np.array_split(values, 10):
+        chunk_sketch = TDigest()
+        chunk_sketch.update(values_chunk)
+        sketch.merge(chunk_sketch)
+    assert sketch.count == len(values)
+    assert len(sketch.means) <= sketch.compression // 2 + 1
+    assert sketch.quantile(quantile) == pytest.approx(np.quantile(values, quantile), rel=0.02)
+
+
+def test_tdigest_empty_and_extremes():
+    sketch = TDigest()
+    assert sketch.quantile(0.5) is None
+    sketch.update(np.array([3.0, np.nan, 1.0, 2.0]))
+    assert sketch.count == 3
+    assert sketch.quantile(0) == 1.0
+    assert sketch.quantile(1) == 3.0
@@ -0,0 +1,76 @@
+import json
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+from template_project.generate_synthetic_wem_rules_clauses import generate_synthetic_wem_rules_clauses
+
+CHAPTERS_COUNT = 3
+# every chapter has the same level sequence, so whole versions have a known level distribution
+CHAPTER_LEVELS = (1, 2, 3, 3)
+VERSION_ROWS = CHAPTERS_COUNT * len(CHAPTER_LEVELS)
+
+
+@pytest.fixture
+def real_clauses_filepath(tmp_path):
+    identifiers_by_level = {1: "{chapter}.", 2: "{chapter}.1.", 3: "{chapter}.1.{clause}."}
+    rows = []
+    for chapter in range(1, CHAPTERS_COUNT + 1):
+        for clause, level in enumerate(CHAPTER_LEVELS):
+            rows.append(
+                {
+                    "identifier": identifiers_by_level[level].format(chapter=chapter, clause=clause),
+                    "content": f"Clause {chapter}.{clause} of the market rules" * level,
+                    "position_in_document": 10 + 2 * len(rows),
+                    "wem_rules_publication_iso_date": "2023-10-01",
+                    "level": level,
+                }
+            )
+    filepath = tmp_path / "wem_rules_clauses.ndjson"
+    filepath.write_text("".join(f"{json.dumps(row)}\n" for row in rows))
+    return filepath.as_posix()
+
+
+def _generate(tmp_path, real_clauses_filepath, rows_count, file_format):
+    output_filepath = generate_synthetic_wem_rules_clauses(
+        output_filepath=(tmp_path / "synthetic" / f"clauses.{file_format}").as_posix(),
+        rows_count=rows_count,
+        file_format=file_format,
+        real_clauses_filepath=real_clauses_filepath,
+        # two versions per chunk, so every run spans several chunks
+        chunk_rows=2 * VERSION_ROWS,
+    )
+    if file_format == "ndjson":
+        return pl.read_ndjson(output_filepath)
+    return pl.read_parquet(output_filepath)
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "ndjson"])
+@pytest.mark.parametrize("rows_count", [5 * VERSION_ROWS + 7, 10 * VERSION_ROWS])
+def test_generate_synthetic_wem_rules_clauses_matches_real_schema_and_row_count(tmp_path, real_clauses_filepath, rows_count, file_format):
+    synthetic_clauses = _generate(tmp_path, real_clauses_filepath, rows_count, file_format)
+    assert synthetic_clauses.schema == pl.read_ndjson(real_clauses_filepath).schema
+    assert synthetic_clauses.height == rows_count
+
+
+def test_generate_synthetic_wem_rules_clauses_level_distribution(tmp_path, real_clauses_filepath):
+    versions_count = 10
+    synthetic_clauses = _generate(tmp_path, real_clauses_filepath, versions_count * VERSION_ROWS, "parquet")
+
+    level_counts = dict(synthetic_clauses.get_column("level").value_counts().iter_rows())
+    assert level_counts == {
+        level: versions_count * CHAPTERS_COUNT * CHAPTER_LEVELS.count(level)
+        for level in set(CHAPTER_LEVELS)
+    }
+    # versions continue across chunks, one publication interval apart
+    assert synthetic_clauses.get_column("wem_rules_publication_iso_date").unique(maintain_order=True).to_list() == [
+        (date(2023, 10, 1) + timedelta(days=7 * version_index)).isoformat()
+        for version_index in range(versions_count)
+    ]
+    # chapters are renumbered in order within every version
+    assert (
+        synthetic_clauses
+        .filter(pl.col("level") == 1)
+        .get_column("identifier")
+        .to_list()
+    ) == [f"{chapter}." for chapter in range(1, CHAPTERS_COUNT + 1)] * versions_count
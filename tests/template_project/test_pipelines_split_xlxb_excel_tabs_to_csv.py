@@ -0,0 +1,257 @@
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+import template_project.pipelines_split_xlxb_excel_tabs_to_csv as pipelines_split_xlxb_excel_tabs_to_csv
+from template_project.helpers.xlsb_writer import (
+    biff12_row,
+    biff12_worksheet,
+    write_xlsb,
+)
+from template_project.pipelines_split_xlxb_excel_tabs_to_csv import (
+    LONG_TRACES_SCHEMA,
+    SHEET_READER_BACKENDS,
+    _write_sheet_to_typed_file,
+    convert_xlxb_excel_tabs_to_typed_files,
+    pipeline_split_xlxb_excel_tabs_to_csv,
+    probe_xlxb_workbook,
+    reshape_trace_to_long_by_financial_year,
+    scan_long_traces,
+    split_xlxb_excel_tabs_to_csv,
+)
+
+
+def _write_xlsb(filepath, sheets):
+    """
+    Write a minimal xlsb workbook from `{sheet_name: rows}`, with string and
+    float cells, and datetime cells as date-styled Excel serials. Rows of
+    only None cells are blank, and leading blank rows are left out of the
+    sheet's used range, as Excel does.
+    """
+    shared_strings = {}
+    worksheets = {}
+    for sheet_name, rows in sheets.items():
+        first_row = next(row_index for row_index, row in enumerate(rows) if any(value is not None for value in row))
+        worksheets[sheet_name] = biff12_worksheet(
+            [biff12_row(row_index, row, shared_strings) for row_index, row in enumerate(rows)],
+            rows_count=len(rows) - first_row,
+            columns_count=max(len(row) for row in rows),
+            first_row=first_row,
+        )
+    return write_xlsb(str(filepath), worksheets, shared_strings)
+
+
+def _trace_rows(rows_count, offset=0.0):
+    return [["timestamp", "demand"]] + [[datetime(2023, 7, 1) + timedelta(minutes=30 * row_index), row_index + offset] for row_index in range(rows_count)]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return _write_xlsb(tmp_path / "traces.xlsb", {"trace_a": _trace_rows(30), "trace_b": _trace_rows(12, offset=0.5)})
+
+
+def test_probe_xlxb_workbook_reports_sheet_ranges_and_header_rows(tmp_path):
+    excel_file_filepath = _write_xlsb(
+        tmp_path / "probe.xlsb",
+        {
+            "trace": _trace_rows(5),
+            # a title and a blank row above the header, with a numeric header cell
+            "offset": [["Region demand", None, None], [None, None, None], ["timestamp", "demand", 2024.0], [datetime(2023, 7, 1), 1.0, 2.0]],
+            "blank_lead": [[None, None], [None, None], ["timestamp", "demand"], [datetime(2023, 7, 1), 1.0]],
+        },
+    )
+    probe = probe_xlxb_workbook(excel_file_filepath, header_rows=3)
+    assert probe.select("sheet_index", "sheet_name", "part_name", "first_row", "last_row", "first_column", "last_column", "rows", "columns").rows() == [
+        (0, "trace", "xl/worksheets/sheet1.bin", 0, 5, 0, 1, 6, 2),
+        (1, "offset", "xl/worksheets/sheet2.bin", 0, 3, 0, 2, 4, 3),
+        (2, "blank_lead", "xl/worksheets/sheet3.bin", 2, 3, 0, 1, 2, 2),
+    ]
+    assert probe.get_column("header_rows").to_list() == [
+        [["timestamp", "demand"], ["45108.0", "0.0"], ["45108.020833333336", "1.0"]],
+        [["Region demand"], [], ["timestamp", "demand", "2024.0"]],
+        # blank rows before the used range probe as empty rows
+        [[], [], ["timestamp", "demand"]],
+    ]
+    assert (probe.get_column("part_bytes") > 0).all()
+    # only the first row is read by default
+    assert probe_xlxb_workbook(excel_file_filepath).get_column("header_rows").to_list() == [[["timestamp", "demand"]], [["Region demand"]], [[]]]
+
+
+def test_split_xlxb_excel_tabs_to_csv_skips_up_to_date_sheets(workbook, tmp_path, caplog):
+    csv_save_directory = str(tmp_path / "csv")
+    csv_filepaths = split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, reader_backend="pyxlsb")
+    modified_nanoseconds = [(tmp_path / "csv" / f"{sheet_name}.csv").stat().st_mtime_ns for sheet_name in ("trace_a", "trace_b")]
+    with caplog.at_level(logging.INFO):
+        assert split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, reader_backend="pyxlsb") == csv_filepaths
+    assert "Skipping 2 of 2 sheets already up to date" in caplog.text
+    assert [(tmp_path / "csv" / f"{sheet_name}.csv").stat().st_mtime_ns for sheet_name in ("trace_a", "trace_b")] == modified_nanoseconds
+
+
+def test_split_xlxb_excel_tabs_to_csv_reconverts_modified_workbook(workbook, tmp_path, caplog):
+    csv_save_directory = str(tmp_path / "csv")
+    split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, reader_backend="pyxlsb")
+    _write_xlsb(workbook, {"trace_a": _trace_rows(30, offset=100.0), "trace_b": _trace_rows(12, offset=0.5)})
+    with caplog.at_level(logging.INFO):
+        split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, reader_backend="pyxlsb")
+    assert "Skipping 0 of 2 sheets already up to date" in caplog.text
+    assert (tmp_path / "csv" / "trace_a.csv").read_text().splitlines()[1] == "45108.0,100.0"
+
+
+@pytest.mark.parametrize("reader_backend", ["calamine", "pandas"])
+def test_sheet_reader_backends_convert_identically_to_pyxlsb(workbook, tmp_path, reader_backend):
+    pytest.importorskip(SHEET_READER_BACKENDS[reader_backend]["module_name"])
+    for output_format, convert in [("csv", split_xlxb_excel_tabs_to_csv), ("parquet", convert_xlxb_excel_tabs_to_typed_files)]:
+        expected_filepaths = convert(workbook, str(tmp_path / output_format / "pyxlsb"), reader_backend="pyxlsb")
+        filepaths = convert(workbook, str(tmp_path / output_format / reader_backend), reader_backend=reader_backend)
+        for filepath, expected_filepath in zip(filepaths, expected_filepaths):
+            if output_format == "csv":
+                assert open(filepath, "rb").read() == open(expected_filepath, "rb").read()
+            else:
+                assert pl.read_parquet(filepath).equals(pl.read_parquet(expected_filepath))
+    assert open(tmp_path / "csv" / reader_backend / "trace_a.csv").read().splitlines()[1:3] == ["45108.0,0.0", "45108.020833333336,1.0"]
+    assert pl.read_parquet(tmp_path / "parquet" / reader_backend / "trace_a.parquet").item(1, "timestamp") == datetime(2023, 7, 1, 0, 30)
+
+
+def test_process_pool_converts_identically_to_serial(workbook, tmp_path):
+    for output_format, convert in [("csv", split_xlxb_excel_tabs_to_csv), ("parquet", convert_xlxb_excel_tabs_to_typed_files)]:
+        expected_filepaths = convert(workbook, str(tmp_path / output_format / "serial"), reader_backend="pyxlsb")
+        filepaths = convert(workbook, str(tmp_path / output_format / "pool"), max_workers=2, reader_backend="pyxlsb")
+        assert [Path(filepath).name for filepath in filepaths] == [Path(filepath).name for filepath in expected_filepaths]
+        for filepath, expected_filepath in zip(filepaths, expected_filepaths):
+            assert open(filepath, "rb").read() == open(expected_filepath, "rb").read()
+
+
+def test_pipeline_split_xlxb_excel_tabs_to_csv_converts_scenarios_in_one_pool(tmp_path, monkeypatch):
+    scenario_sheets = {
+        "POE10_Low": {"trace_a": _trace_rows(30), "trace_b": _trace_rows(12, offset=0.5)},
+        "POE10_High": {"trace_a": _trace_rows(20, offset=100.0)},
+    }
+    monkeypatch.setattr(pipelines_split_xlxb_excel_tabs_to_csv, "MAIN_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(pipelines_split_xlxb_excel_tabs_to_csv, "PIPELINE_RAW_FILES", {scenario: f"{scenario}.xlsb" for scenario in scenario_sheets})
+    for scenario, sheets in scenario_sheets.items():
+        (tmp_path / "01_Input" / scenario).mkdir(parents=True)
+        _write_xlsb(tmp_path / "01_Input" / scenario / f"{scenario}.xlsb", sheets)
+
+    csv_filepaths = pipeline_split_xlxb_excel_tabs_to_csv(list(scenario_sheets), max_workers=2, chunk_rows=10, reader_backend="pyxlsb")
+
+    assert list(csv_filepaths) == list(scenario_sheets)
+    for scenario, sheets in scenario_sheets.items():
+        intermediate_directory = tmp_path / "02_Processing" / "01_Intermediate" / scenario
+        assert csv_filepaths[scenario] == [str(intermediate_directory / f"{sheet_name}.csv") for sheet_name in sheets]
+        expected_csv_filepaths = split_xlxb_excel_tabs_to_csv(
+            str(tmp_path / "01_Input" / scenario / f"{scenario}.xlsb"),
+            str(tmp_path / "expected" / scenario),
+            reader_backend="pyxlsb",
+        )
+        for csv_filepath, expected_csv_filepath in zip(csv_filepaths[scenario], expected_csv_filepaths):
+            assert open(csv_filepath, "rb").read() == open(expected_csv_filepath, "rb").read()
+
+
+def _interrupt_sheet_rows(monkeypatch, after_rows):
+    iter_sheet_rows = SHEET_READER_BACKENDS["pyxlsb"]["iter_sheet_rows"]
+
+    def iter_sheet_rows_until_interrupted(workbook, sheet_name):
+        for row_index, values in enumerate(iter_sheet_rows(workbook, sheet_name)):
+            if row_index == after_rows:
+                raise KeyboardInterrupt
+            yield values
+
+    monkeypatch.setitem(SHEET_READER_BACKENDS["pyxlsb"], "iter_sheet_rows", iter_sheet_rows_until_interrupted)
+
+
+@pytest.mark.parametrize(("resumed_chunk_rows", "expect_resume"), [(10, True), (7, False)])
+def test_split_xlxb_excel_tabs_to_csv_resumes_interrupted_sheet(workbook, tmp_path, monkeypatch, caplog, resumed_chunk_rows, expect_resume):
+    expected_csv_filepaths = split_xlxb_excel_tabs_to_csv(workbook, str(tmp_path / "expected"), reader_backend="pyxlsb")
+
+    csv_save_directory = str(tmp_path / "csv")
+    with monkeypatch.context() as interrupted:
+        _interrupt_sheet_rows(interrupted, after_rows=25)
+        with pytest.raises(KeyboardInterrupt):
+            split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, chunk_rows=10, reader_backend="pyxlsb")
+    assert sorted(path.name for path in (tmp_path / "csv" / "trace_a.csv.tmp.parts").glob("part-*.csv")) == ["part-00000.csv", "part-00001.csv"]
+
+    with caplog.at_level(logging.INFO):
+        csv_filepaths = split_xlxb_excel_tabs_to_csv(workbook, csv_save_directory, chunk_rows=resumed_chunk_rows, reader_backend="pyxlsb")
+    # a changed chunk size discards the committed parts and restarts the sheet
+    assert ("Resuming sheet 'trace_a' after 20 committed rows" in caplog.text) is expect_resume
+    for csv_filepath, expected_csv_filepath in zip(csv_filepaths, expected_csv_filepaths):
+        with open(csv_filepath, "rb") as csv_file, open(expected_csv_filepath, "rb") as expected_csv_file:
+            assert csv_file.read() == expected_csv_file.read()
+    assert not list((tmp_path / "csv").glob("*.tmp*"))
+
+
+def test_write_sheet_to_typed_file_keeps_dates_and_logs_dropped_values(tmp_path, caplog):
+    rows = iter(
+        [
+            ["timestamp", "demand", "flag"],
+            [datetime(2023, 7, 1, 0, 30), 1.5, "estimated"],
+            [45108.0416666667, 2.5, None],
+        ]
+    )
+    with caplog.at_level(logging.WARNING):
+        output_filepath = _write_sheet_to_typed_file(rows, "trace", str(tmp_path / "trace.parquet"))
+    typed_sheet = pl.read_parquet(output_filepath)
+    assert typed_sheet.get_column("timestamp").dt.round("1s").to_list() == [
+        datetime(2023, 7, 1, 0, 30),
+        datetime(2023, 7, 1, 1),
+    ]
+    assert typed_sheet.get_column("demand").to_list() == [1.5, 2.5]
+    assert typed_sheet.get_column("flag").to_list() == [None, None]
+    assert "1 non-numeric data cells written as nulls" in caplog.text
+
+
+@pytest.fixture
+def converted_trace(tmp_path):
+    # a units row, then half-hourly Excel serial timestamps either side of the 2023-24 financial year start
+    (tmp_path / "trace_a.csv").write_text(
+        "timestamp,component_1,component_2\n"
+        ",MW,MW\n"
+        "45107.979166666664,1.0,2.0\n"
+        "45108.0,3.0,4.0\n"
+        "45108.020833333336,5.0,6.0\n"
+    )
+    return str(tmp_path / "trace_a.csv")
+
+
+def test_reshape_trace_to_long_by_financial_year(converted_trace, tmp_path):
+    dataset_directory = str(tmp_path / "long")
+    assert reshape_trace_to_long_by_financial_year(converted_trace, dataset_directory)
+    assert sorted(path.relative_to(dataset_directory).as_posix() for path in (tmp_path / "long").rglob("*.parquet")) == [
+        "financial_year=2022-23/trace_a.parquet",
+        "financial_year=2023-24/trace_a.parquet",
+    ]
+    long_traces = scan_long_traces(dataset_directory).sort("timestamp", "component").collect()
+    assert long_traces.schema == LONG_TRACES_SCHEMA
+    assert long_traces.rows()[:3] == [
+        (datetime(2023, 6, 30, 23, 30), "trace_a", "component_1", 1.0, "2022-23"),
+        (datetime(2023, 6, 30, 23, 30), "trace_a", "component_2", 2.0, "2022-23"),
+        (datetime(2023, 7, 1), "trace_a", "component_1", 3.0, "2023-24"),
+    ]
+    assert long_traces.height == 6
+
+    # a rerun replaces the trace's files, including years it no longer spans
+    (tmp_path / "trace_a.csv").write_text("timestamp,component_1\n45108.0,7.0\n")
+    reshape_trace_to_long_by_financial_year(converted_trace, dataset_directory)
+    assert scan_long_traces(dataset_directory).select("financial_year", "value").collect().rows() == [("2023-24", 7.0)]
+
+
+def test_reshape_trace_to_long_by_financial_year_skips_non_trace_sheets(tmp_path):
+    (tmp_path / "notes.csv").write_text("note,value\nscenario,central\n")
+    assert not reshape_trace_to_long_by_financial_year(str(tmp_path / "notes.csv"), str(tmp_path / "long"))
+    assert not (tmp_path / "long").exists()
+
+
+def test_scan_long_traces_filters_financial_years(converted_trace, tmp_path):
+    dataset_directory = str(tmp_path / "long")
+    reshape_trace_to_long_by_financial_year(converted_trace, dataset_directory)
+    assert scan_long_traces(dataset_directory, first_financial_year="2023-24").collect().get_column("financial_year").unique().to_list() == ["2023-24"]
+    assert scan_long_traces(dataset_directory, last_financial_year="2022-23").collect().get_column("financial_year").unique().to_list() == ["2022-23"]
+    assert scan_long_traces(dataset_directory, first_financial_year="2030-31").collect().is_empty()
+
+
+def test_scan_long_traces_empty_dataset(tmp_path):
+    long_traces = scan_long_traces(str(tmp_path / "long"), first_financial_year="2023-24").collect()
+    assert long_traces.is_empty()
+    assert long_traces.schema == LONG_TRACES_SCHEMA
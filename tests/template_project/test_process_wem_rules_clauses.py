@@ -0,0 +1,556 @@
+import json
+from datetime import date
+from functools import partial
+
+import polars as pl
+import pytest
+from template_project.process_wem_rules_clauses import (
+    COLLECT_STRATEGIES,
+    PIPELINE_BACKENDS,
+    WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+    LazyDataCatalog,
+    benchmark_collect_strategies,
+    benchmark_pipeline_backends,
+    build_term_document_matrix,
+    compare_run_logs,
+    describe_lazyframe_approximately,
+    pipe_classify_clause_identifiers,
+    pipe_derive_clause_hierarchy,
+    pipe_sample_by_hash,
+    pipeline_process_wem_rules_clauses,
+    refresh_ipc_mirror,
+    run_pipelines,
+    run_pipelines_async,
+    run_pipeline_incrementally,
+    run_pipeline_on_backend,
+    scan_ndjson_files_to_lazyframe,
+    sink_lazyframe,
+    validate_execution_plans,
+    write_hive_partitioned_parquet,
+)
+
+
+def _clauses(rows):
+    return pl.LazyFrame(
+        rows,
+        schema={
+            "identifier": pl.Utf8,
+            "content": pl.Utf8,
+            "position_in_document": pl.UInt16,
+            "wem_rules_publication_date": pl.Date,
+            "level": pl.UInt8,
+        },
+        orient="row",
+    )
+
+
+@pytest.fixture
+def clauses():
+    # rows out of document order, so the hierarchy must sort them first
+    return _clauses(
+        [
+            ("1.2.", "Section 1.2", 5, date(2023, 10, 1), 2),
+            ("1.", "Chapter 1", 1, date(2023, 10, 1), 1),
+            ("3.1.", "Section 3.1", 1, date(2024, 4, 1), 2),
+            ("1.1.1.", "Clause 1.1.1", 3, date(2023, 10, 1), 3),
+            ("1.1.", "Section 1.1", 2, date(2023, 10, 1), 2),
+            ("(a)", "Paragraph (a)", 4, date(2023, 10, 1), 4),
+            ("2.", "Chapter 2", 6, date(2023, 10, 1), 1),
+        ]
+    )
+
+
+def test_pipe_derive_clause_hierarchy_known_ancestors(clauses):
+    hierarchy = (
+        clauses
+        .pipe(pipe_derive_clause_hierarchy)
+        .select("identifier", "chapter_identifier", "section_identifier", "parent_identifier", "clause_path")
+        .collect()
+    )
+    assert hierarchy.rows() == [
+        ("1.", "1.", None, None, "1."),
+        ("1.1.", "1.", "1.1.", "1.", "1. > 1.1."),
+        ("1.1.1.", "1.", "1.1.", "1.1.", "1. > 1.1. > 1.1.1."),
+        ("(a)", "1.", "1.1.", "1.1.1.", "1. > 1.1. > 1.1.1. > (a)"),
+        ("1.2.", "1.", "1.2.", "1.", "1. > 1.2."),
+        ("2.", "2.", None, None, "2."),
+        # a new WEM Rules version resets the ancestors of its first clauses
+        ("3.1.", None, "3.1.", None, "3.1."),
+    ]
+
+
+@pytest.fixture
+def scanned_clauses(clauses, tmp_path):
+    # a scanned source, so plans can run on the streaming engine
+    clauses.collect().write_parquet(tmp_path / "clauses.parquet")
+    return pl.scan_parquet(tmp_path / "clauses.parquet")
+
+
+def test_pipeline_derives_clause_hierarchy_only_when_opted_in(clauses):
+    assert pipeline_process_wem_rules_clauses(clauses).columns == clauses.columns
+    assert "clause_path" in pipeline_process_wem_rules_clauses(clauses, derive_clause_hierarchy=True).columns
+
+
+@pytest.mark.parametrize(
+    ("identifier", "level", "expected_match"),
+    [
+        ("1.", 1, True),
+        ("1.1.", 1, False),
+        ("1.1.", 2, True),
+        ("1.", 2, False),
+        ("1.1.1.", 3, True),
+        ("Step 1:", 3, True),
+        ("(a)", 3, False),
+        ("(a)", 4, True),
+        ("1.", 4, False),
+        ("iv", 5, True),
+        ("(a)", 5, False),
+        ("1.", 6, False),
+        ("1.", None, False),
+    ],
+)
+def test_pipe_classify_clause_identifiers_by_level(identifier, level, expected_match):
+    classified = _clauses([(identifier, "", 1, date(2023, 10, 1), level)]).pipe(pipe_classify_clause_identifiers).collect()
+    assert classified.item(0, "identifier_matches_level_regex") is expected_match
+
+
+def test_pipe_classify_clause_identifiers_preserves_row_order(clauses):
+    classified = clauses.pipe(pipe_classify_clause_identifiers).collect()
+    assert classified.drop("identifier_matches_level_regex").equals(clauses.collect())
+    assert classified.get_column("identifier_matches_level_regex").all()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "ipc", "csv", "ndjson"])
+def test_sink_lazyframe_streams_default_pipeline(scanned_clauses, tmp_path, file_format):
+    lf = pipeline_process_wem_rules_clauses(scanned_clauses)
+    output_filepath = sink_lazyframe(lf, file_format=file_format, output_filepath=str(tmp_path / f"output.{file_format}"))
+    readers = {"parquet": pl.read_parquet, "ipc": pl.read_ipc, "csv": pl.read_csv, "ndjson": pl.read_ndjson}
+    assert readers[file_format](output_filepath).height == lf.collect().height
+
+
+def test_sink_lazyframe_falls_back_in_memory_for_clause_hierarchy(scanned_clauses, tmp_path):
+    lf = pipeline_process_wem_rules_clauses(scanned_clauses, derive_clause_hierarchy=True)
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        sink_lazyframe(lf, output_filepath=str(tmp_path / "output.parquet"))
+    output_filepath = sink_lazyframe(lf, output_filepath=str(tmp_path / "output.parquet"), allow_in_memory_fallback=True)
+    assert pl.read_parquet(output_filepath).equals(lf.collect())
+
+
+def test_write_hive_partitioned_parquet_replaces_rewritten_versions(clauses, tmp_path):
+    output_directory = str(tmp_path / "partitioned")
+    write_hive_partitioned_parquet(clauses, output_directory=output_directory)
+    # rewrite the 2023-10-01 version without its level 3 and 4 clauses
+    write_hive_partitioned_parquet(
+        clauses.filter((pl.col("wem_rules_publication_date") == date(2023, 10, 1)) & (pl.col("level") <= 2)),
+        output_directory=output_directory,
+    )
+    partitions = sorted(
+        path.relative_to(output_directory).parent.as_posix() for path in (tmp_path / "partitioned").rglob("*.parquet")
+    )
+    assert partitions == [
+        "wem_rules_publication_date=2023-10-01/level=1",
+        "wem_rules_publication_date=2023-10-01/level=2",
+        "wem_rules_publication_date=2024-04-01/level=2",
+    ]
+    level_2 = pl.read_parquet(tmp_path / "partitioned" / "wem_rules_publication_date=2023-10-01" / "level=2" / "part-0.parquet")
+    assert level_2.get_column("identifier").to_list() == ["1.1.", "1.2."]
+
+
+def test_benchmark_collect_strategies_reports_every_strategy(scanned_clauses):
+    benchmark_results = benchmark_collect_strategies(
+        pipeline_process_wem_rules_clauses(scanned_clauses),
+        run_name="smoke",
+        warmup_runs=1,
+        repeat_runs=2,
+        results_filepath=None,
+    )
+    assert benchmark_results.get_column("collect_strategy").sort().to_list() == sorted(COLLECT_STRATEGIES)
+    assert benchmark_results.get_column("successful_runs").to_list() == [2] * len(COLLECT_STRATEGIES)
+    assert benchmark_results.get_column("run_name").unique().to_list() == ["smoke"]
+    # the absolute peak is never below the baseline the increase is measured from
+    assert (benchmark_results.get_column("peak_rss_mebibytes") >= benchmark_results.get_column("baseline_rss_mebibytes")).all()
+    assert benchmark_results.get_column("cold_peak_memory_increase_mebibytes").is_not_null().all()
+
+
+def test_benchmark_collect_strategies_leaves_out_failing_strategies(monkeypatch):
+    def fail_to_collect(lf):
+        raise pl.exceptions.ComputeError("out of memory")
+
+    monkeypatch.setitem(COLLECT_STRATEGIES, "failing", fail_to_collect)
+    benchmark_results = benchmark_collect_strategies(
+        pl.LazyFrame({"a": [1, 2, 3]}),
+        warmup_runs=0,
+        repeat_runs=1,
+        results_filepath=None,
+    )
+    assert "failing" not in benchmark_results.get_column("collect_strategy").to_list()
+    assert benchmark_results.height == len(COLLECT_STRATEGIES) - 1
+
+
+def test_describe_lazyframe_approximately_default_pipeline(scanned_clauses):
+    lf = pipeline_process_wem_rules_clauses(scanned_clauses)
+    description = describe_lazyframe_approximately(lf)
+    statistics = dict(zip(description.get_column("statistic"), description.get_column("identifier")))
+    assert statistics["count"] == "7"
+    assert statistics["null_count"] == "0"
+    assert statistics["min"] == "(a)"
+    assert statistics["approx_n_unique"] == "7"
+    positions = dict(zip(description.get_column("statistic"), description.get_column("position_in_document")))
+    assert (positions["min"], positions["max"]) == ("1", "6")
+
+
+@pytest.mark.parametrize(("profile_plans", "expected_executions"), [(False, 1), (True, 2)])
+def test_run_pipelines_profiles_plans_only_when_opted_in(scanned_clauses, tmp_path, profile_plans, expected_executions):
+    executed_batches = []
+
+    def record_batch(batch):
+        executed_batches.append(batch.height)
+        return batch
+
+    run_queue = [
+        {
+            "run_name": "counted_run",
+            "pipeline": pipeline_process_wem_rules_clauses,
+            "inputs": {"lf": scanned_clauses.map_batches(record_batch)},
+            "parameters": {},
+            "output_strategy": pl.LazyFrame.collect,
+        },
+    ]
+    run_log_filepath = str(tmp_path / "run_log.ndjson")
+    run_pipelines(run_queue=run_queue, run_log_filepath=run_log_filepath, profile_plans=profile_plans)
+    run_pipelines(run_queue=run_queue, run_log_filepath=run_log_filepath, profile_plans=profile_plans)
+
+    assert len(executed_batches) == 2 * expected_executions
+    run_log = pl.read_ndjson(run_log_filepath)
+    assert run_log.get_column("wall_time_seconds").is_not_null().all()
+    compared_nodes = compare_run_logs(run_log_filepath=run_log_filepath).get_column("node").to_list()
+    assert "output_strategy" in compared_nodes
+    assert (len(compared_nodes) > 1) is profile_plans
+
+
+def test_build_term_document_matrix_counts_terms_per_document():
+    version_date = date(2023, 10, 1)
+    term_document_matrix, vocabulary, documents = build_term_document_matrix(
+        _clauses(
+            [
+                ("1.", "Market rules, market.", 1, version_date, 1),
+                ("1.1.", "Rules apply", 2, version_date, 2),
+                # no term reaches the minimum length, so the document keeps an empty row
+                ("(a)", "a", 3, version_date, 4),
+            ]
+        ),
+        output_directory=None,
+    )
+    assert vocabulary.rows() == [(0, "apply", 1), (1, "market", 1), (2, "rules", 2)]
+    assert documents.rows() == [(0, version_date, 1), (1, version_date, 2), (2, version_date, 3)]
+    assert term_document_matrix.toarray().tolist() == [[0, 2, 1], [1, 0, 1], [0, 0, 0]]
+
+
+def test_build_term_document_matrix_keeps_documents_with_null_keys(clauses):
+    term_document_matrix, vocabulary, documents = build_term_document_matrix(
+        clauses.pipe(pipe_derive_clause_hierarchy),
+        document_columns=("wem_rules_publication_date", "chapter_identifier"),
+        output_directory=None,
+    )
+    # the 2024-04-01 version starts at section 3.1., before any chapter
+    assert documents.rows() == [
+        (0, date(2023, 10, 1), "1."),
+        (1, date(2023, 10, 1), "2."),
+        (2, date(2024, 4, 1), None),
+    ]
+    section_term_id = vocabulary.filter(pl.col("term") == "section").item(0, "term_id")
+    assert term_document_matrix[:, section_term_id].toarray().ravel().tolist() == [2, 0, 1]
+
+
+def _output_strategy_run_queue_item(output_strategy, output_parameters=None):
+    return {
+        "run_name": "validated_run",
+        "pipeline": pipeline_process_wem_rules_clauses,
+        "inputs": {},
+        "parameters": {},
+        "output_strategy": output_strategy,
+        "output_parameters": output_parameters or {},
+    }
+
+
+@pytest.mark.parametrize(
+    ("output_strategy", "output_parameters", "dropped_column"),
+    [
+        # read through the default quantile expressions
+        (describe_lazyframe_approximately, None, "content"),
+        (describe_lazyframe_approximately, None, "position_in_document"),
+        # read through the default document columns
+        (build_term_document_matrix, None, "wem_rules_publication_date"),
+        (build_term_document_matrix, None, "content"),
+        # read through document columns passed as output parameters
+        (build_term_document_matrix, {"document_columns": ("identifier",)}, "identifier"),
+        (partial(write_hive_partitioned_parquet, sort_column="identifier"), None, "identifier"),
+    ],
+)
+def test_validate_execution_plans_rejects_missing_columns(clauses, output_strategy, output_parameters, dropped_column):
+    run_queue = [_output_strategy_run_queue_item(output_strategy, output_parameters)]
+    with pytest.raises(ValueError, match=f"column '{dropped_column}' expected by the output strategy is missing"):
+        validate_execution_plans(run_queue=run_queue, execution_plans=[clauses.drop(dropped_column)])
+
+
+@pytest.mark.parametrize(
+    "output_strategy",
+    [describe_lazyframe_approximately, build_term_document_matrix, write_hive_partitioned_parquet, pl.LazyFrame.collect],
+)
+def test_validate_execution_plans_accepts_valid_plans(clauses, output_strategy):
+    validate_execution_plans(run_queue=[_output_strategy_run_queue_item(output_strategy)], execution_plans=[clauses])
+
+
+def test_validate_execution_plans_rejects_catalog_dtype_mismatch(clauses):
+    run_queue = [_output_strategy_run_queue_item(describe_lazyframe_approximately)]
+    with pytest.raises(ValueError, match="column 'position_in_document' is Int64"):
+        validate_execution_plans(
+            run_queue=run_queue,
+            execution_plans=[clauses.with_columns(pl.col("position_in_document").cast(pl.Int64))],
+        )
+
+
+def test_lazy_data_catalog_expands_globs_on_first_access(tmp_path):
+    raw_data = LazyDataCatalog(
+        {
+            "versions": partial(
+                scan_ndjson_files_to_lazyframe,
+                source=(tmp_path / "wem_rules_clauses*.ndjson").as_posix(),
+                catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+            ),
+        }
+    )
+    assert list(raw_data) == ["versions"]
+    with pytest.raises(FileNotFoundError):
+        raw_data["versions"]
+
+    (tmp_path / "wem_rules_clauses_2023-10-01.ndjson").write_text(
+        '{"identifier": "1.", "content": "Chapter 1", "position_in_document": 1, '
+        '"wem_rules_publication_iso_date": "2023-10-01", "level": 1}\n'
+    )
+    versions = raw_data["versions"]
+    assert raw_data["versions"] is versions
+    assert versions.collect().get_column("identifier").to_list() == ["1."]
+
+
+def _write_ndjson_source(filepath):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_text(
+        '{"identifier": "1.", "content": "Chapter 1", "position_in_document": 1, '
+        '"wem_rules_publication_iso_date": "2023-10-01", "level": 1}\n'
+    )
+    return filepath.as_posix()
+
+
+def test_refresh_ipc_mirror_keys_mirrors_on_full_source_path(tmp_path):
+    mirror_directory = str(tmp_path / "ipc_mirrors")
+    first_mirror = refresh_ipc_mirror(
+        _write_ndjson_source(tmp_path / "2023" / "wem_rules_clauses.ndjson"),
+        catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+        mirror_directory=mirror_directory,
+    )
+    second_mirror = refresh_ipc_mirror(
+        _write_ndjson_source(tmp_path / "2024" / "wem_rules_clauses.ndjson"),
+        catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+        mirror_directory=mirror_directory,
+    )
+    assert first_mirror != second_mirror
+
+
+def test_refresh_ipc_mirror_rewrites_mirror_when_catalog_schema_changes(tmp_path):
+    source = _write_ndjson_source(tmp_path / "wem_rules_clauses.ndjson")
+    mirror_directory = str(tmp_path / "ipc_mirrors")
+    mirror = refresh_ipc_mirror(source, catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA, mirror_directory=mirror_directory)
+    assert pl.read_ipc(mirror, memory_map=False).schema["level"] == pl.UInt8
+
+    widened_catalog_schema = {
+        **WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+        "dtypes": {**WEM_RULES_CLAUSES_CATALOG_SCHEMA["dtypes"], "level": pl.Int64},
+    }
+    mirror = refresh_ipc_mirror(source, catalog_schema=widened_catalog_schema, mirror_directory=mirror_directory)
+    assert pl.read_ipc(mirror, memory_map=False).schema["level"] == pl.Int64
+
+
+def _clause_line(identifier, position_in_document, level):
+    return (
+        f'{{"identifier": "{identifier}", "content": "Clause {identifier}", "position_in_document": {position_in_document}, '
+        f'"wem_rules_publication_iso_date": "2023-10-01", "level": {level}}}\n'
+    )
+
+
+@pytest.fixture
+def run_incrementally(tmp_path):
+    def run(source):
+        return run_pipeline_incrementally(
+            source,
+            catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+            output_directory=str(tmp_path / "incremental"),
+            watermarks_filepath=str(tmp_path / "watermarks.json"),
+        )
+
+    return run
+
+
+def _incremental_identifiers(tmp_path):
+    return pl.read_parquet(tmp_path / "incremental" / "*.parquet").get_column("identifier").sort().to_list()
+
+
+def test_run_pipeline_incrementally_advances_watermark(tmp_path, run_incrementally):
+    source = tmp_path / "wem_rules_clauses.ndjson"
+    source.write_text(_clause_line("1.", 1, 1) + _clause_line("1.1.", 2, 2))
+    assert run_incrementally(source.as_posix()) == 2
+    with source.open("a") as source_file:
+        source_file.write(_clause_line("1.2.", 3, 2))
+    assert run_incrementally(source.as_posix()) == 1
+
+    watermarks = json.loads((tmp_path / "watermarks.json").read_text())
+    assert watermarks[source.resolve().as_posix()]["byte_offset"] == source.stat().st_size
+    assert len(list((tmp_path / "incremental").glob("*.parquet"))) == 2
+    assert _incremental_identifiers(tmp_path) == ["1.", "1.1.", "1.2."]
+
+
+def test_run_pipeline_incrementally_holds_back_partial_trailing_line(tmp_path, run_incrementally):
+    source = tmp_path / "wem_rules_clauses.ndjson"
+    partial_line = _clause_line("1.1.", 2, 2)
+    source.write_text(_clause_line("1.", 1, 1) + partial_line[:20])
+    assert run_incrementally(source.as_posix()) == 1
+    # the rest of the line lands, so the held back line is processed whole
+    with source.open("a") as source_file:
+        source_file.write(partial_line[20:])
+    assert run_incrementally(source.as_posix()) == 1
+    assert _incremental_identifiers(tmp_path) == ["1.", "1.1."]
+
+
+@pytest.mark.parametrize(
+    "rewritten_source_text",
+    [
+        pytest.param(_clause_line("1.", 1, 1), id="truncated"),
+        pytest.param(_clause_line("2.", 1, 1) + _clause_line("2.1.", 2, 2) + _clause_line("2.2.", 3, 2), id="rewritten"),
+    ],
+)
+def test_run_pipeline_incrementally_rejects_rewritten_source(tmp_path, run_incrementally, rewritten_source_text):
+    source = tmp_path / "wem_rules_clauses.ndjson"
+    source.write_text(_clause_line("1.", 1, 1) + _clause_line("1.1.", 2, 2))
+    run_incrementally(source.as_posix())
+    source.write_text(rewritten_source_text)
+    with pytest.raises(ValueError, match="remove its watermark"):
+        run_incrementally(source.as_posix())
+
+
+def test_run_pipeline_incrementally_reruns_idempotently(tmp_path, run_incrementally):
+    source = tmp_path / "wem_rules_clauses.ndjson"
+    source.write_text(_clause_line("1.", 1, 1) + _clause_line("1.1.", 2, 2))
+    assert run_incrementally(source.as_posix()) == 2
+    assert run_incrementally(source.as_posix()) == 0
+    # a failure before the watermark was saved re-runs the increment, overwriting its part file
+    (tmp_path / "watermarks.json").unlink()
+    assert run_incrementally(source.as_posix()) == 2
+    assert _incremental_identifiers(tmp_path) == ["1.", "1.1."]
+
+
+def test_run_pipeline_incrementally_keys_parts_on_full_source_path(tmp_path, run_incrementally):
+    run_incrementally(_write_ndjson_source(tmp_path / "2023" / "wem_rules_clauses.ndjson"))
+    run_incrementally(_write_ndjson_source(tmp_path / "2024" / "wem_rules_clauses.ndjson"))
+    assert len(list((tmp_path / "incremental").glob("*.parquet"))) == 2
+
+
+def test_run_pipelines_async_passes_plans_and_isolates_failures(scanned_clauses, tmp_path):
+    received_plans = []
+
+    def failing_output_strategy(lf):
+        raise KeyError("not a collect failure")
+
+    run_queue = [
+        {
+            "run_name": f"run_{run_index}",
+            "pipeline": pipeline_process_wem_rules_clauses,
+            "inputs": {"lf": scanned_clauses},
+            "parameters": {},
+            "output_strategy": output_strategy,
+            "output_parameters": output_parameters,
+        }
+        for run_index, (output_strategy, output_parameters) in enumerate(
+            [
+                (failing_output_strategy, {}),
+                (sink_lazyframe, {"output_filepath": str(tmp_path / "output.parquet")}),
+                (lambda lf: received_plans.append(lf.explain()), {}),
+            ]
+        )
+    ]
+    run_pipelines_async(run_queue=run_queue)
+    # output strategies get the plan over the source, not a collected result
+    assert "Parquet SCAN" in received_plans[0]
+    assert pl.read_parquet(tmp_path / "output.parquet").height == scanned_clauses.collect().height
+
+
+def _hierarchy_run_queue_item(lf, output_strategy, sampling_parameters):
+    return {
+        "run_name": "sampled_hierarchy_run",
+        "pipeline": pipeline_process_wem_rules_clauses,
+        "inputs": {"lf": lf},
+        "parameters": {"derive_clause_hierarchy": True},
+        "output_strategy": output_strategy,
+        "sampling_strategy": pipe_sample_by_hash,
+        "sampling_parameters": sampling_parameters,
+    }
+
+
+def test_sampled_clause_hierarchy_matches_full_output(clauses):
+    sampled_outputs = []
+    run_pipelines(
+        run_queue=[
+            _hierarchy_run_queue_item(
+                clauses,
+                output_strategy=lambda lf: sampled_outputs.append(lf.collect()),
+                sampling_parameters={"fraction": 0.5, "column": "wem_rules_publication_date"},
+            ),
+        ]
+    )
+    sampled_output = sampled_outputs[0]
+    full_output = pipeline_process_wem_rules_clauses(clauses, derive_clause_hierarchy=True).collect()
+    assert 0 < sampled_output.height < full_output.height
+    assert sampled_output.equals(
+        full_output.filter(pl.col("wem_rules_publication_date").is_in(sampled_output.get_column("wem_rules_publication_date")))
+    )
+
+
+def test_sampling_clauses_within_versions_rejected_for_clause_hierarchy(clauses):
+    with pytest.raises(ValueError, match="whole WEM Rules versions"):
+        run_pipelines(
+            run_queue=[
+                _hierarchy_run_queue_item(clauses, output_strategy=pl.LazyFrame.collect, sampling_parameters={"fraction": 0.5}),
+            ]
+        )
+
+
+@pytest.mark.parametrize("derive_clause_hierarchy", [False, True])
+def test_pipeline_backends_agree(clauses, tmp_path, derive_clause_hierarchy):
+    source = (tmp_path / "clauses.parquet").as_posix()
+    (
+        clauses
+        .collect()
+        .rename({"wem_rules_publication_date": "wem_rules_publication_iso_date"})
+        .write_parquet(source)
+    )
+    backend_outputs = {
+        backend_name: run_pipeline_on_backend(
+            backend_name,
+            source,
+            catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+            file_format="parquet",
+            derive_clause_hierarchy=derive_clause_hierarchy,
+        ).sort("wem_rules_publication_date", "position_in_document")
+        for backend_name in PIPELINE_BACKENDS
+    }
+    assert all(backend_output.equals(backend_outputs["polars"]) for backend_output in backend_outputs.values())
+
+    benchmark_results = benchmark_pipeline_backends(
+        source,
+        catalog_schema=WEM_RULES_CLAUSES_CATALOG_SCHEMA,
+        file_format="parquet",
+        pipeline_parameters={"derive_clause_hierarchy": derive_clause_hierarchy},
+        warmup_runs=0,
+        repeat_runs=1,
+        results_filepath=None,
+    )
+    assert set(benchmark_results.get_column("backend")) == set(PIPELINE_BACKENDS)